@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""
+Analyzer Benchmark Suite
+Times the utilities.py hot paths at several dataset sizes, records wall time,
+peak memory and throughput to JSON, and compares a run against a baseline
+
+Usage:
+    python benchmark.py
+    python benchmark.py --sizes 10000 100000 --repeat 5
+    python benchmark.py --save-baseline
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import config
+import ingest
+from generate_data import JobDataGenerator
+from utilities import (
+    DataProcessor, MarketAnalyzer, RoleRecommender, SalarySketch, SkillIndex, SkillsAnalyzer, TitleIndex,
+    TransitionGraph, TransitionPathFinder
+)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+RESULTS_FILE = "benchmarks/results.json"
+BASELINE_FILE = "benchmarks/baseline.json"
+
+# Queries used by the role-level cases (the dashboard's default roles)
+ROLE = 'QA Engineer'
+TARGET_ROLE = 'Senior QA Engineer'
+USER_SKILLS = ['Python', 'SQL', 'AWS', 'Docker']
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+
+def make_dataset(source, size, seed=0):
+    """Raw postings frame of exactly `size` rows, resampled from source with a fixed seed"""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(source), size)
+    return source.iloc[rows].reset_index(drop=True)
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+def _cases(raw):
+    """(name, run) pairs over one raw dataset; the processed frame and indexes are built once and shared"""
+    state = {}
+
+    def processed():
+        if 'df' not in state:
+            state['df'] = DataProcessor.process_data(raw)
+        return state['df']
+
+    def index(name, build):
+        if name not in state:
+            state[name] = build()
+        return state[name]
+
+    def title_index():
+        return index('titles', lambda: TitleIndex(processed()['title']))
+
+    def skill_index():
+        return index('skills', lambda: SkillIndex.build(processed()['title']))
+
+    def build_graph():
+        return TransitionGraph.build(
+            processed(), skill_index(), min_postings=config.MIN_JOB_POSTINGS_THRESHOLD,
+            max_neighbors=config.TRANSITION_MAX_NEIGHBORS
+        )
+
+    def graph():
+        return index('graph', build_graph)
+
+    def recommender():
+        return index('recommender', lambda: RoleRecommender.build(processed(), skill_index()))
+
+    def salary_sketch():
+        return index('salaries', lambda: SalarySketch.build(processed(), config.EXPERIENCE_LEVELS))
+
+    return [
+        ('process_data', lambda: DataProcessor.process_data(raw)),
+        ('extract_skills', lambda: SkillsAnalyzer.extract_skills_series(processed()['title'])),
+        ('build_title_index', lambda: TitleIndex(processed()['title'])),
+        ('build_skill_index', lambda: SkillIndex.build(processed()['title'])),
+        ('get_skills_by_role', lambda: SkillsAnalyzer.get_skills_by_role(processed(), ROLE)),
+        ('get_skills_by_role_indexed', lambda: SkillsAnalyzer.get_skills_by_role(
+            processed(), ROLE, skill_index=skill_index(), title_index=title_index())),
+        ('get_skills_by_category', lambda: SkillsAnalyzer.get_skills_by_category(
+            processed(), processed()['primary_category'].iloc[0])),
+        ('get_role_stats', lambda: MarketAnalyzer.get_role_stats(processed(), ROLE)),
+        ('get_role_stats_indexed', lambda: MarketAnalyzer.get_role_stats(
+            processed(), ROLE, title_index=title_index())),
+        ('get_salary_by_experience', lambda: MarketAnalyzer.get_salary_by_experience(processed())),
+        ('build_transition_graph', build_graph),
+        ('find_stepping_stones', lambda: TransitionPathFinder.find_stepping_stones(
+            processed(), ROLE, TARGET_ROLE)),
+        ('find_stepping_stones_graph', lambda: TransitionPathFinder.find_stepping_stones(
+            processed(), ROLE, TARGET_ROLE, graph=graph())),
+        ('build_recommender', lambda: RoleRecommender.build(processed(), skill_index())),
+        ('best_fit_roles', lambda: recommender().best_fit_roles(
+            USER_SKILLS, 10, config.MIN_JOB_POSTINGS_THRESHOLD)),
+        ('build_salary_sketch', lambda: SalarySketch.build(processed(), config.EXPERIENCE_LEVELS)),
+        ('salary_bands', lambda: salary_sketch().quantiles(role=ROLE)),
+    ]
+
+
+def _measure(func, repeat):
+    """Best wall time over `repeat` runs, then peak traced memory of one more run"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak / (1024 * 1024)
+
+
+def run_benchmarks(dataset, sizes, repeat=3, cases=None):
+    """Run every case at every size; dataset(size) returns the raw frame for a size"""
+    results = []
+    for size in sizes:
+        raw = dataset(size)
+        for name, func in _cases(raw):
+            if cases and name not in cases:
+                continue
+            # Warm-up run builds the shared inputs outside the timed region
+            func()
+            seconds, peak_mb = _measure(func, repeat)
+            results.append({
+                'case': name,
+                'size': size,
+                'seconds': round(seconds, 6),
+                'peak_mb': round(peak_mb, 2),
+                'rows_per_second': round(size / seconds, 1) if seconds else None
+            })
+            print(f"  {name:<28} {size:>12,} rows  {seconds:10.4f}s  {peak_mb:9.1f} MB")
+        del raw
+    return results
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def environment():
+    """Machine details stored next to the results"""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, threshold=0.2):
+    """Time ratio (current / baseline) per case and size, and the regressions beyond threshold"""
+    previous = {(r['case'], r['size']): r for r in baseline}
+    rows, regressions = [], []
+    for result in results:
+        base = previous.get((result['case'], result['size']))
+        if base is None or not base['seconds']:
+            continue
+        ratio = result['seconds'] / base['seconds']
+        row = {**result, 'baseline_seconds': base['seconds'], 'ratio': round(ratio, 3)}
+        rows.append(row)
+        if ratio > 1 + threshold:
+            regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    """Run the suite from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark the utilities.py analyzers")
+    parser.add_argument('--csv', default=config.DATA_FILE, help="Source CSV resampled to each size")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="Generate each dataset with generate_data.py instead (no network or CSV needed)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Dataset sizes (rows)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument('--cases', nargs='+', help="Only run these cases")
+    parser.add_argument('--seed', type=int, default=0, help="Resampling / generator seed")
+    parser.add_argument('--output', default=RESULTS_FILE, help="Results JSON file")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Also store this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        generator = JobDataGenerator(seed=args.seed)
+        dataset = generator.frame
+    else:
+        print(f"Loading {args.csv} ...")
+        source, _ = ingest.read_job_csv(args.csv)
+        dataset = lambda size: make_dataset(source, size, args.seed)
+
+    print("Running benchmarks ...")
+    results = run_benchmarks(dataset, args.sizes, args.repeat, args.cases)
+    save_results(results, args.output)
+    print(f"✅ Results written to {args.output}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    rows, regressions = compare(results, load_results(args.baseline), args.threshold)
+    print(f"\nComparison with {args.baseline}:")
+    for row in rows:
+        flag = "  ⚠️ REGRESSION" if row in regressions else ""
+        print(f"  {row['case']:<28} {row['size']:>12,} rows  {row['baseline_seconds']:10.4f}s -> "
+              f"{row['seconds']:10.4f}s  ({row['ratio']:.2f}x){flag}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
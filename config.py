@@ -19,10 +19,67 @@ APP_DESCRIPTION = "Data-driven insights for personalized career progression"
 DATA_FILE = "hf://datasets/eshern/careerpath-data/SGJobData.csv"
 CACHE_ENABLED = True
 CACHE_TTL = 3600  # 1 hour in seconds
+ROLE_STATS_CACHE_SIZE = 512  # Distinct role queries kept in the shared stats cache
+SESSION_RESULTS_KEEP = 5  # Page analyses kept per session, keyed by a hash of their inputs
+
+# Serve a slim categorical frame (DataProcessor.COMPACT_COLUMNS) shared by all sessions
+COMPACT_FRAME = True
+
+# pyarrow CSV reader block size; each block is parsed on its own thread
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Processes for category parsing and skill extraction when the app loads the CSV
+# (1 = serial, None = all cores). Serial by default: a process pool forked inside the
+# threaded Streamlit server gains nothing below a few million rows. snapshot.py uses
+# all cores unless --workers is given.
+PREPROCESS_WORKERS = 1
+
+# Streaming mode: aggregate the CSV block by block instead of loading every posting.
+# Memory is bounded by the block size; pages are served from the aggregates only.
+STREAMING_MODE = False
+STREAM_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Local columnar snapshot of DATA_FILE (build with: python snapshot.py)
+SNAPSHOT_DIR = "data/snapshot"
+SNAPSHOT_FILE = "postings.parquet"
+SKILL_INDEX_FILE = "skills.npz"  # postings x skills sparse matrix
+CUBE_FILE = "market_cube.parquet"  # pre-aggregated Home & Overview cells
+TRANSITION_GRAPH_FILE = "transition_graph.npz"  # role transition graph
+FUZZY_INDEX_FILE = "title_vectors.npz"  # char n-gram TF-IDF vectors of the distinct titles
+SALARY_SKETCH_FILE = "salary_sketch.parquet"  # salary quantile sketches per role, category and experience
+SALARY_TITLES_FILE = "salary_titles.parquet"  # normalized titles of each salary sketch role
+SNAPSHOT_COMPRESSION = "zstd"
+QUARANTINE_FILE = "bad_lines.csv"  # malformed CSV lines rejected while building the snapshot
 
 # Data filtering thresholds
 MAX_EXPERIENCE_FILTER = 20  # Don't show roles requiring > 20 years
 MIN_JOB_POSTINGS_THRESHOLD = 10  # Minimum postings to show role
+TRANSITION_MAX_NEIGHBORS = 10  # Outgoing edges kept per role in the transition graph
+FUZZY_MIN_SIMILARITY = 0.5  # Cosine similarity needed to substitute the closest title for an unmatched role
+CANONICAL_TITLE_SIMILARITY = 0.75  # Word Jaccard (same head noun) needed to merge two titles into one role family
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+# Prometheus text metrics (metrics.py): timing spans, cache hits and misses
+METRICS_FILE = "data/metrics/careerpath.prom"  # None to disable the file export
+METRICS_EXPORT_INTERVAL = 15  # Seconds between file writes
+METRICS_PORT = None  # e.g. 9108 to serve http://127.0.0.1:9108/metrics
+
+# Admin tools (metrics panel, Slow Runs page): on for every session with ADMIN_MODE,
+# otherwise only for users signed in with st.login whose email is in ADMIN_EMAILS
+ADMIN_MODE = False
+ADMIN_EMAILS = []
+
+# Slow rerun capture (profiler.py): a sample of script runs is profiled and any
+# run slower than the threshold is saved with its inputs
+PROFILE_SLOW_RUNS = False  # Opt in
+PROFILE_THRESHOLD = 3.0  # Seconds
+PROFILE_SAMPLE_RATE = 0.25  # Fraction of runs executed under cProfile
+PROFILE_DIR = "data/profiles"
+PROFILE_KEEP = 50  # Newest captures kept on disk
+IMPORT_BUDGET_SECONDS = 2.0  # Allowed import time of the dashboard module (python profiler.py)
 
 # ============================================================================
 # SKILLS CONFIGURATION
@@ -13,17 +13,27 @@ Target Users:
 - Career switchers/transitioning professionals
 """
 # from datasets import load_dataset
+# Plotting libraries are imported by the pages that draw charts, keeping
+# startup (and the first page of a fresh replica) fast; see profiler.import_report
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from sklearn.preprocessing import MinMaxScaler
-from collections import Counter
+import functools
+import hashlib
 import json
+import threading
 import warnings
+from contextlib import nullcontext
+import config
+import metrics
+import profiler
+import snapshot
+from engine import CareerEngine
 warnings.filterwarnings('ignore')
 
+# The job frame is cached once and shared by every session; copy-on-write keeps
+# slices taken by the pages from ever writing back into it
+pd.set_option('mode.copy_on_write', True)
+
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
@@ -69,125 +79,851 @@ st.markdown("""
 # ============================================================================
 # DATA LOADING AND CACHING
 # ============================================================================
-@st.cache_data
-def load_data():
-    """Load and preprocess the job data"""
+@st.cache_resource(max_entries=1)
+def load_engine(data_version):
+    """Load the job data and its analytics engine (shared read-only across sessions)
+    
+    data_version is the snapshot build (snapshot.snapshot_version), so a
+    rebuilt snapshot replaces the cached engine on the next run.
+    """
+
+    # Prefer the local Parquet snapshot (python snapshot.py) over the remote CSV
+    if snapshot.snapshot_exists():
+        try:
+            return CareerEngine.from_snapshot()
+        except Exception as e:
+            st.warning(f"Could not read data snapshot, falling back to CSV: {e}")
 
     # csv_path = "data/SGJobData.csv"
-    csv_path = "hf://datasets/eshern/careerpath-data/SGJobData.csv"
+    csv_path = config.DATA_FILE
     
     try:
         # ds = load_dataset("eshern/careerpath-data", data_files="SGJobData.csv")
         # df = ds["train"].to_pandas()
 
-        df = pd.read_csv(csv_path, on_bad_lines='skip')
-        
-        # Data cleaning
-        df['minimumYearsExperience'] = pd.to_numeric(df['minimumYearsExperience'], errors='coerce').fillna(0).astype(int)
-        df['salary_minimum'] = pd.to_numeric(df['salary_minimum'], errors='coerce').fillna(0)
-        df['salary_maximum'] = pd.to_numeric(df['salary_maximum'], errors='coerce').fillna(0)
-        df['average_salary'] = (df['salary_minimum'] + df['salary_maximum']) / 2
-        
-        # Extract categories from JSON
-        df['primary_category'] = df['categories'].apply(extract_category)
-        
-        # Clean position levels
-        df['positionLevels'] = df['positionLevels'].fillna('Not Specified')
-        
-        return df
+        # Data cleaning happens in the same vectorized pipeline as the snapshot builder
+        if config.STREAMING_MODE:
+            return CareerEngine.from_csv_stream(csv_path)
+        return CareerEngine.from_csv(csv_path)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
-@st.cache_data
-def extract_category(cat_string):
-    """Extract primary category from JSON string"""
-    if pd.isna(cat_string):
-        return 'Unknown'
-    try:
-        cats = json.loads(cat_string.replace("'", '"'))
-        if cats and len(cats) > 0:
-            return cats[0].get('category', 'Unknown')
-    except:
-        pass
-    return 'Unknown'
+def resolve_role_input(engine, role):
+    """The typed role, or the closest real title when no posting matches it"""
+    resolved = engine.resolve_role(role)
+    show_role_fallback(engine, role, resolved)
+    return resolved
+
+def show_role_fallback(engine, role, resolved):
+    """Tell the user when their typed role was replaced by the closest real title"""
+    if resolved != role:
+        others = [engine.display_name(s['role']) for s in engine.similar_roles(role, k=4) if s['role'] != resolved]
+        st.info(
+            f"No postings match “{role}”. Showing the closest role: **{engine.display_name(resolved)}**"
+            + (f" (also close: {', '.join(others)})" if others else "")
+        )
+
+def show_chart(fig):
+    """Render a plotly figure, timed as its own span"""
+    with metrics.span('chart'):
+        st.plotly_chart(fig, use_container_width=True)
 
 # ============================================================================
-# HELPER FUNCTIONS
+# INSTRUMENTATION
 # ============================================================================
-def extract_skills_from_title(title):
-    """Extract technical skills from job title"""
-    if pd.isna(title):
-        return []
-    
-    title = str(title).upper()
-    skills_keywords = {
-        'Python', 'Java', 'SQL', 'C++', 'C#', 'JavaScript', 'React', 'Node',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Git', 'Linux',
-        'Machine Learning', 'AI', 'Data Science', 'Analytics', 'BI',
-        'Tableau', 'Power BI', 'Salesforce', 'SAP', 'Oracle',
-        'Agile', 'Scrum', 'Product Management', 'Project Management',
-        'Leadership', 'Management', 'Team Lead', 'Technical Lead',
-        'Frontend', 'Backend', 'Full Stack', 'DevOps', 'QA', 'SDET'
-    }
+def metrics_panel(engine):
+    """Sidebar panel with span latencies and cache hit rates (admin only)"""
+    with st.sidebar.expander("📈 Performance Metrics"):
+        spans = pd.DataFrame(metrics.REGISTRY.span_summary())
+        if spans.empty:
+            st.caption("No spans recorded yet.")
+        else:
+            st.dataframe(
+                spans.sort_values('total_s', ascending=False).round(2),
+                hide_index=True, use_container_width=True
+            )
+        
+        lookups = {
+            k: v for k, v in metrics.REGISTRY.counter_values('cache_lookups_total').items()
+            if ('cache', 'role_stats') in k
+        }
+        hits = sum(v for k, v in lookups.items() if ('result', 'hit') in k)
+        misses = sum(v for k, v in lookups.items() if ('result', 'miss') in k)
+        if hits + misses:
+            st.caption(f"Role stats cache: {hits:,} hits / {misses:,} misses "
+                       f"({hits / (hits + misses):.0%} hit rate, {len(engine.role_stats_cache)} entries)")
+        
+        st.download_button(
+            "Download Prometheus metrics",
+            metrics.REGISTRY.render_prometheus(),
+            file_name="careerpath.prom",
+            mime="text/plain"
+        )
+
+def is_admin():
+    """Admin tools are on in config or for signed-in users listed in config.ADMIN_EMAILS
     
-    found_skills = []
-    for skill in skills_keywords:
-        if skill.upper() in title:
-            found_skills.append(skill)
+    Never decided by anything in the URL: the admin pages show other users'
+    captured inputs.
+    """
+    if config.ADMIN_MODE:
+        return True
+    return bool(config.ADMIN_EMAILS) and bool(st.user.get('is_logged_in')) and (
+        st.user.get('email') in config.ADMIN_EMAILS
+    )
+
+# Set while main() runs, so fragments can tell a full script run from their own reruns
+_full_run = threading.local()
+
+def page_fragment(page):
+    """Decorator timing and slow-run capturing a fragment's own reruns as its page
     
-    return found_skills
+    Full script runs are already timed and captured around main(); a widget
+    inside a fragment reruns only the fragment, which never passes through it.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_full_run, 'active', False):
+                return func(*args, **kwargs)
+            with slow_run_capture(run='fragment'), metrics.span('page', page=page, run='fragment'):
+                profiler.record_inputs(page=page)
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+SLOW_RUNS = profiler.SlowRunProfiler(
+    config.PROFILE_DIR, threshold=config.PROFILE_THRESHOLD,
+    sample_rate=config.PROFILE_SAMPLE_RATE, keep=config.PROFILE_KEEP
+)
+
+def slow_run_capture(**context):
+    """Capture this script run if it turns out slow (config.PROFILE_SLOW_RUNS)"""
+    if not config.PROFILE_SLOW_RUNS:
+        return nullcontext()
+    return SLOW_RUNS.capture(query=dict(st.query_params), **context)
+
+def slow_runs_page():
+    """Admin page listing captured slow runs with their inputs and profiles"""
+    st.markdown("## 🩺 Slow Runs")
+    st.markdown(
+        f"Script runs slower than **{config.PROFILE_THRESHOLD:.1f}s**, with the inputs that produced them. "
+        f"About {config.PROFILE_SAMPLE_RATE:.0%} of runs are profiled."
+    )
+    if not config.PROFILE_SLOW_RUNS:
+        st.info("Slow run capture is off. Set `PROFILE_SLOW_RUNS = True` in config.py to enable it.")
+    
+    captures = SLOW_RUNS.captures()
+    if not captures:
+        st.caption(f"No slow runs captured in `{config.PROFILE_DIR}` yet.")
+        return
+    
+    st.dataframe(
+        pd.DataFrame([{
+            'time': c['timestamp'],
+            'page': c['inputs'].get('page'),
+            'run': c.get('run', 'full'),
+            'seconds': c['seconds'],
+            'profiled': c.get('profile_file') is not None,
+            'error': c.get('error', '')
+        } for c in captures]),
+        hide_index=True, use_container_width=True
+    )
+    
+    labels = {f"{c['timestamp']} · {c['inputs'].get('page')} · {c['seconds']:.1f}s": c for c in captures}
+    capture = labels[st.selectbox("Capture:", list(labels))]
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.markdown("**Inputs**")
+        st.json(capture['inputs'])
+    with col2:
+        path = SLOW_RUNS.profile_path(capture)
+        if path is None:
+            st.info("This run was not sampled for profiling.")
+        else:
+            sort = st.radio("Sort by:", ['cumulative', 'tottime', 'calls'], horizontal=True)
+            st.dataframe(
+                pd.DataFrame(profiler.top_functions(path, sort=sort)),
+                hide_index=True, use_container_width=True
+            )
+            with open(path, 'rb') as f:
+                st.download_button(
+                    "Download .prof (pstats / snakeviz)", f.read(),
+                    file_name=capture['profile_file'], mime="application/octet-stream"
+                )
+
+def import_budget_panel():
+    """Admin section measuring the dashboard's import time against config.IMPORT_BUDGET_SECONDS"""
+    st.divider()
+    st.markdown("### ⏱️ Startup Import Budget")
+    st.caption("Imports the dashboard in a fresh interpreter (`python -X importtime`), "
+               "as a new replica does before serving its first page.")
+    if not st.button("Measure import time"):
+        return
+    
+    with st.spinner("Importing dashboard in a fresh interpreter..."):
+        report = profiler.import_report('dashboard', config.IMPORT_BUDGET_SECONDS)
+    st.metric(
+        "Import time", f"{report['total_s']:.2f}s",
+        f"{report['total_s'] - report['budget_s']:+.2f}s vs {report['budget_s']:.1f}s budget",
+        delta_color="inverse"
+    )
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.dataframe(pd.DataFrame(report['packages']), hide_index=True, use_container_width=True)
+    with col2:
+        st.dataframe(
+            pd.DataFrame(report['modules'])[['module', 'cumulative_ms', 'self_ms']].round(1),
+            hide_index=True, use_container_width=True
+        )
+
+def export_metrics():
+    """Publish metrics to the configured file and endpoint"""
+    if config.METRICS_PORT:
+        metrics.serve(config.METRICS_PORT)
+    if config.METRICS_FILE:
+        try:
+            metrics.REGISTRY.export(config.METRICS_FILE, config.METRICS_EXPORT_INTERVAL)
+        except OSError:
+            pass
+
+# ============================================================================
+# SESSION RESULTS
+# ============================================================================
+def analysis_key(engine, name, inputs):
+    """Hash of an analysis name, its inputs and the loaded data version"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(f"{name}|{engine.data_version}|{payload}".encode()).hexdigest()
 
-def categorize_experience_level(years):
-    """Categorize professional based on years of experience"""
-    if years < 2:
-        return 'Entry Level (0-2 years)'
-    elif years < 5:
-        return 'Early Career (2-5 years)'
-    elif years < 10:
-        return 'Mid Career (5-10 years)'
+def cached_analysis(engine, name, inputs, compute):
+    """Result of compute() for these inputs, kept in session state across reruns
+    
+    The newest config.SESSION_RESULTS_KEEP results per analysis are kept, so
+    going back to earlier inputs does not recompute them. The result becomes
+    the one current_analysis(name) returns.
+    """
+    results = st.session_state.setdefault(f'{name}_results', {})
+    key = analysis_key(engine, name, inputs)
+    hit = key in results
+    metrics.inc('cache_lookups_total', cache='session_results', result='hit' if hit else 'miss')
+    
+    result = results.pop(key) if hit else {'inputs': inputs, **compute()}
+    results[key] = result  # Newest last
+    while len(results) > config.SESSION_RESULTS_KEEP:
+        results.pop(next(iter(results)))
+    st.session_state[f'{name}_current'] = key
+    return result
+
+def current_analysis(name):
+    """The last analysis computed under `name` in this session (None before the first)"""
+    return st.session_state.get(f'{name}_results', {}).get(st.session_state.get(f'{name}_current'))
+
+# ============================================================================
+# ANALYSIS PAGES
+# ============================================================================
+@st.fragment
+@page_fragment("👤 Mid-Career Professional")
+def mid_career_section(engine):
+    """Mid-Career inputs and results; changing a widget reruns only this section
+    
+    The analysis runs only on Analyze and is kept in session state, so other
+    reruns redraw the last result without recomputing it.
+    """
+    inputs, analyze = mid_career_inputs()
+    if analyze:
+        with st.spinner("Analyzing job market and identifying opportunities..."):
+            cached_analysis(engine, 'mid_career', inputs, lambda: analyze_mid_career(engine, inputs))
+    mid_career_results(engine)
+
+def mid_career_inputs():
+    """Mid-Career profile and goal widgets, returning (inputs, Analyze clicked)"""
+    # User Input Section
+    st.markdown("### 📝 Your Current Profile")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        current_role = st.selectbox(
+            "Your Current Role/Title:",
+            options=['QA Engineer', 'Software Engineer', 'Data Analyst', 'Product Manager', 
+                    'Business Analyst', 'DevOps Engineer', 'Solution Architect', 'Other']
+        )
+    
+    with col2:
+        years_exp = st.slider(
+            "Years of Experience:",
+            min_value=3, max_value=20, value=5, step=1
+        )
+    
+    with col3:
+        current_salary = st.number_input(
+            "Current Monthly Salary ($):",
+            min_value=2000, max_value=15000, value=5000, step=500
+        )
+    
+    st.divider()
+    
+    # Current skills
+    st.markdown("### 🛠️ Your Current Skills")
+    col1, col2 = st.columns(2)
+    
+    all_skills = ['Python', 'Java', 'SQL', 'AWS', 'Azure', 'Docker', 'Kubernetes', 
+                 'JavaScript', 'React', 'Node.js', 'Machine Learning', 'Data Science',
+                 'Project Management', 'Leadership', 'Agile', 'Communication']
+    
+    with col1:
+        current_skills = st.multiselect(
+            "Select skills you currently have:",
+            options=all_skills,
+            default=all_skills[:3]
+        )
+    
+    with col2:
+        proficiency_levels = {}
+        st.write("**Proficiency Level:**")
+        for skill in current_skills:
+            proficiency_levels[skill] = st.select_slider(
+                f"{skill}:",
+                options=['Beginner', 'Intermediate', 'Advanced', 'Expert'],
+                value='Intermediate',
+                key=f"prof_{skill}"
+            )
+    
+    st.divider()
+    
+    # Career goals
+    st.markdown("### 🎯 Your Career Goals")
+    career_goal = st.selectbox(
+        "What's your primary career goal?",
+        options=[
+            "Promotion within current role",
+            "Transition to higher-level role",
+            "Domain/technology shift",
+            "Leadership track",
+            "Specialist/Expert track"
+        ]
+    )
+    
+    target_role = st.text_input(
+        "Target role (e.g., 'Senior SDET', 'Team Lead', 'Product Manager'):",
+        value="Senior " + current_role
+    )
+    
+    st.divider()
+    
+    analyze = st.button("🔍 Analyze My Career Path", type="primary", use_container_width=True)
+    inputs = dict(
+        current_role=current_role, years_exp=years_exp, current_salary=current_salary,
+        current_skills=current_skills, proficiency_levels=proficiency_levels,
+        career_goal=career_goal, target_role=target_role
+    )
+    profiler.record_inputs(**inputs, analyze=analyze)
+    return inputs, analyze
+
+def analyze_mid_career(engine, inputs):
+    """Market stats, skill gaps and stepping stones for the Mid-Career inputs"""
+    # Misspelled or paraphrased targets fall back to the closest real title
+    target_role = engine.resolve_role(inputs['target_role'])
+    
+    # Skills across every matching posting, compared case-insensitively by the engine
+    gaps = engine.skill_gaps(inputs['current_skills'], target_role)
+    missing = set(gaps)
+    
+    return {
+        'target_role': target_role,
+        'current_stats': engine.role_stats(inputs['current_role']),
+        'target_stats': engine.role_stats(target_role),
+        'skill_match': engine.skill_match(inputs['current_skills'], target_role),
+        'overlaps': sorted(skill for skill in engine.role_skills(target_role) if skill not in missing),
+        'gaps': gaps,
+        'stepping_stones': engine.stepping_stones(inputs['current_role'], target_role, max_gaps=3),
+    }
+
+def mid_career_results(engine):
+    """Last Mid-Career analysis of this session, kept across reruns"""
+    analysis = current_analysis('mid_career')
+    if analysis is None:
+        return
+    
+    inputs = analysis['inputs']
+    current_salary = inputs['current_salary']
+    target_role = analysis['target_role']
+    current_stats, target_stats = analysis['current_stats'], analysis['target_stats']
+    gaps, overlaps = analysis['gaps'], analysis['overlaps']
+    stepping_stones = analysis['stepping_stones']
+    show_role_fallback(engine, inputs['target_role'], target_role)
+    
+    # Create analysis columns
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📊 Current Role Market Analysis")
+        
+        if current_stats:
+            st.metric("Number of Openings", value=current_stats['count'])
+            st.metric("Average Salary", value=f"${current_stats['avg_salary']:,.0f}/month")
+            st.metric("Avg Exp Required", value=f"{current_stats['avg_experience']:.1f} years")
+        else:
+            st.info("Limited data for exact role match. Showing related opportunities...")
+    
+    with col2:
+        st.markdown("### 🎯 Target Role Market Analysis")
+        
+        if target_stats:
+            st.metric("Number of Openings", value=target_stats['count'])
+            st.metric("Average Salary", value=f"${target_stats['avg_salary']:,.0f}/month")
+            st.metric("Avg Exp Required", value=f"{target_stats['avg_experience']:.1f} years")
+            
+            # Salary jump calculation
+            salary_jump = target_stats['avg_salary'] - current_salary
+            jump_percentage = (salary_jump / current_salary * 100) if current_salary > 0 else 0
+            st.success(f"💰 Potential Salary Jump: ${salary_jump:,.0f}/month ({jump_percentage:.1f}%)")
+        else:
+            st.warning("Limited data for target role. Try a different target.")
+    
+    st.divider()
+    
+    # Skills gap analysis
+    st.markdown("### 🔍 Skills Gap Analysis")
+    st.metric("Skill Match", value=f"{analysis['skill_match']:.0f}%")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### ✅ Skills You Already Have")
+        if overlaps:
+            for skill in overlaps:
+                st.success(f"• {skill}")
+        else:
+            st.info("Add relevant skills to see matches")
+    
+    with col2:
+        st.markdown("#### ❌ Skills Gap (Missing)")
+        if gaps:
+            st.warning(f"You're missing {len(gaps)} key skills:")
+            for skill in gaps:
+                st.warning(f"• {skill}")
+        else:
+            st.success("Great! Your skills align well with target role!")
+    
+    st.divider()
+    
+    # Stepping stones from the role transition graph
+    st.markdown("### 🪜 Stepping-Stone Roles")
+    
+    if stepping_stones:
+        for stone in stepping_stones:
+            st.info(
+                f"**{engine.display_name(stone['role'])}** — ${stone['avg_salary']:,.0f}/month, "
+                f"{stone['avg_experience']:.1f} years typical\n\n"
+                f"Path: {' → '.join(engine.display_name(role) for role in stone['path'])}"
+            )
     else:
-        return 'Senior (10+ years)'
+        st.info("No intermediate roles found between these titles in the current data.")
+    
+    st.divider()
+    
+    # Upskilling roadmap
+    st.markdown("### 📚 Personalized Upskilling Roadmap")
+    
+    if gaps:
+        st.info(f"""
+        **Timeline Estimate:** 3-6 months to gain proficiency in {len(gaps)} key skills
+        
+        **Recommended Learning Path:**
+        """)
+        
+        roadmap_tabs = st.tabs(['Quick Path (3 months)', 'Thorough Path (6 months)', 'Expert Path (12 months)'])
+        
+        with roadmap_tabs[0]:
+            st.markdown("""
+            Focus on the top 2-3 most impactful skills:
+            1. **Month 1:** Online courses + hands-on projects
+            2. **Month 2:** Build portfolio projects
+            3. **Month 3:** Practice interview scenarios
+            """)
+        
+        with roadmap_tabs[1]:
+            st.markdown("""
+            Balanced approach across all critical skills:
+            1. **Months 1-2:** Core concept learning
+            2. **Months 3-4:** Intermediate projects
+            3. **Months 5-6:** Advanced scenarios + interviews
+            """)
+        
+        with roadmap_tabs[2]:
+            st.markdown("""
+            Deep expertise development:
+            1. **Months 1-4:** Strong foundational learning
+            2. **Months 5-8:** Advanced applications
+            3. **Months 9-12:** Expert-level projects + certifications
+            """)
+    
+    st.divider()
+    
+    # Salary projection
+    st.markdown("### 💹 Your Salary Growth Projection")
+    
+    milestones = ['Current', 'With Key Skills (3-6mo)', 'Promoted (12mo)', 'Senior Role (24mo)']
+    projected_salaries = [
+        current_salary,
+        current_salary * 1.15,
+        current_salary * 1.35,
+        current_salary * 1.65
+    ]
+    
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=milestones,
+        y=projected_salaries,
+        mode='lines+markers',
+        fill='tozeroy',
+        line_color='#00CC96',
+        marker=dict(size=12),
+        fillcolor='rgba(0, 204, 150, 0.1)'
+    ))
+    fig.update_layout(
+        title='Your Salary Growth Projection',
+        yaxis_title='Monthly Salary ($)',
+        height=400,
+        template="plotly_white",
+        hovermode='x unified'
+    )
+    show_chart(fig)
+    
+    st.divider()
+    
+    # Action items
+    st.markdown("### ✨ Recommended Next Steps")
+    
+    steps = [
+        ("🎓", "Enroll in online courses", "Platforms: Coursera, Udemy, LinkedIn Learning"),
+        ("💻", "Build portfolio projects", "GitHub projects showcasing your skills"),
+        ("🤝", "Network in your target domain", "LinkedIn, meetups, conferences"),
+        ("📝", "Update your resume", "Highlight transferable skills"),
+        ("🗣️", "Practice interviews", "Focus on behavioral + technical questions")
+    ]
+    
+    for emoji, step, detail in steps:
+        st.info(f"{emoji} **{step}**\n\n{detail}")
+
+@st.fragment
+@page_fragment("🔄 Career Switcher")
+def transition_section(engine):
+    """Career Switcher inputs and results; changing a widget reruns only this section"""
+    inputs, analyze = transition_inputs()
+    if analyze:
+        with st.spinner("Analyzing career transition opportunities..."):
+            cached_analysis(engine, 'transition', inputs, lambda: analyze_transition(engine, inputs))
+    transition_results(engine)
 
-def calculate_skill_match(user_skills, job_skills, weight_match=0.6):
-    """Calculate how well user skills match job requirements"""
-    user_skills_set = set([s.lower() for s in user_skills])
-    job_skills_set = set([s.lower() for s in job_skills])
+def transition_inputs():
+    """Career Switcher background and skill widgets, returning (inputs, Analyze clicked)"""
+    st.markdown("### 📝 Your Current Background")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        current_domain = st.selectbox(
+            "Your Current Domain/Field:",
+            options=['Engineering', 'Operations', 'Teaching/Education', 'Sales/Business Development',
+                    'Finance', 'Government/Public Service', 'Hospitality', 'Healthcare',
+                    'Manufacturing', 'Consulting', 'Other']
+        )
+        
+        current_years = st.slider(
+            "Years in Current Field:",
+            min_value=1, max_value=30, value=5, step=1
+        )
+    
+    with col2:
+        target_domain = st.selectbox(
+            "Target Domain/Field:",
+            options=['Product Management', 'Data Science', 'Cloud Engineering', 
+                    'Learning & Development (L&D)', 'HR/People Operations', 'Software Engineering',
+                    'Project Management', 'Business Analysis', 'UX/UI Design', 'Other']
+        )
     
-    if len(job_skills_set) == 0:
-        return 100
+    st.divider()
     
-    matches = user_skills_set.intersection(job_skills_set)
-    match_percentage = (len(matches) / len(job_skills_set)) * 100
+    st.markdown("### 🛠️ Your Transferable Skills")
     
-    return round(match_percentage, 1)
+    transferable_skills = st.multiselect(
+        "Select skills you have that transfer across domains:",
+        options=['Project Management', 'Communication', 'Leadership', 'Problem Solving',
+                'Data Analysis', 'Training/Teaching', 'Customer Relations', 'Strategic Thinking',
+                'Process Improvement', 'Technical Writing', 'Agile Methodology', 'Attention to Detail'],
+        default=['Communication', 'Problem Solving']
+    )
+    
+    st.divider()
+    
+    analyze = st.button("🔍 Analyze My Transition Path", type="primary", use_container_width=True)
+    inputs = dict(
+        current_domain=current_domain, current_years=current_years, target_domain=target_domain,
+        transferable_skills=transferable_skills
+    )
+    profiler.record_inputs(**inputs, analyze=analyze)
+    return inputs, analyze
 
-def find_skill_gaps(user_skills, target_job_data):
-    """Identify missing skills for a target role"""
-    user_skills_set = set([s.lower() for s in user_skills])
-    job_skills = set()
+def analyze_transition(engine, inputs):
+    """Target domain stats, transition difficulty and skill gaps for the Career Switcher inputs"""
+    current_years, target_domain = inputs['current_years'], inputs['target_domain']
+    transferable_skills = inputs['transferable_skills']
+    
+    # Find roles that match skills
+    domain_stats = engine.role_stats(target_domain)
+    
+    # Calculate transition difficulty
+    transition_difficulty = "Moderate"
+    difficulty_color = "🟡"
     
-    for _, row in target_job_data.iterrows():
-        skills = extract_skills_from_title(row['title'])
-        job_skills.update([s.lower() for s in skills])
+    if domain_stats:
+        avg_exp_target = domain_stats['avg_experience']
+        
+        if current_years >= avg_exp_target * 0.5:
+            transition_difficulty = "Low-Moderate"
+            difficulty_color = "🟢"
+        elif current_years >= avg_exp_target * 0.3:
+            transition_difficulty = "Moderate"
+            difficulty_color = "🟡"
+        else:
+            transition_difficulty = "Challenging"
+            difficulty_color = "🔴"
     
-    gaps = job_skills - user_skills_set
-    return list(gaps)
+    # Critical skills for the target domain
+    if target_domain == "Data Science":
+        required_skills = ['Python', 'SQL', 'Machine Learning', 'Statistics', 'Data Visualization']
+    elif target_domain == "Product Management":
+        required_skills = ['Product Strategy', 'User Research', 'Data Analysis', 'Communication', 'Leadership']
+    elif target_domain == "Cloud Engineering":
+        required_skills = ['AWS/Azure/GCP', 'DevOps', 'Containerization', 'Infrastructure as Code', 'System Design']
+    elif target_domain == "Learning & Development (L&D)":
+        required_skills = ['Instructional Design', 'Learning Technologies', 'Training Facilitation', 'Adult Learning Theory']
+    else:
+        required_skills = ['Technical Skills', 'Domain Knowledge', 'Industry Standards']
+    
+    # Identify skill gaps
+    gaps = [s for s in required_skills if s not in transferable_skills]
+    matches = [s for s in required_skills if s in transferable_skills]
+    
+    return {
+        'domain_stats': domain_stats,
+        'transition_difficulty': transition_difficulty,
+        'difficulty_color': difficulty_color,
+        'required_skills': required_skills,
+        'gaps': gaps,
+        'matches': matches,
+    }
+
+def transition_results(engine):
+    """Last Career Switcher analysis of this session, kept across reruns"""
+    analysis = current_analysis('transition')
+    if analysis is None:
+        return
+    
+    domain_stats = analysis['domain_stats']
+    transition_difficulty = analysis['transition_difficulty']
+    gaps, matches = analysis['gaps'], analysis['matches']
+    
+    st.markdown("### 📊 Transition Feasibility Analysis")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Transition Difficulty", value=transition_difficulty)
+    
+    with col2:
+        st.metric("Target Domain Openings", value=domain_stats['count'] if domain_stats else 0)
+    
+    with col3:
+        if domain_stats:
+            st.metric("Avg Salary (Target)", f"${domain_stats['avg_salary']:,.0f}")
+    
+    st.divider()
+    
+    # Transition paths
+    st.markdown("### 🗺️ Recommended Transition Paths")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Path 1: Direct Transition (Fast Track)")
+        st.markdown("""
+        **Timeline:** 6-12 months
+        
+        **Steps:**
+        1. Identify overlapping skills
+        2. Fill critical knowledge gaps
+        3. Build portfolio/projects in new domain
+        4. Network and find mentors
+        5. Apply to entry/junior roles in new domain
+        
+        **Best for:** Strong foundational skills + dedicated learning
+        """)
+    
+    with col2:
+        st.markdown("#### Path 2: Gradual Transition (Stepping Stone)")
+        st.markdown("""
+        **Timeline:** 18-24 months
+        
+        **Steps:**
+        1. Find intermediate roles combining both domains
+        2. Build experience in new domain part-time
+        3. Develop new domain expertise gradually
+        4. Transition full-time with hybrid background
+        5. Leverage unique perspective as competitive advantage
+        
+        **Best for:** Risk mitigation + stable income
+        """)
+    
+    st.divider()
+    
+    # Skills gap for transition
+    st.markdown("### 🎯 Critical Skills You Need")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.success(f"**Your Advantages ({len(matches)} matches):**")
+        if matches:
+            for skill in matches:
+                st.success(f"✅ {skill}")
+        
+        st.markdown("""
+        **Leverage your transferable skills in:**
+        - Team collaboration and communication
+        - Project delivery and management
+        - Cross-functional work
+        - Understanding business needs
+        """)
+    
+    with col2:
+        st.warning(f"**Skills to Develop ({len(gaps)} gaps):**")
+        if gaps:
+            for skill in gaps:
+                st.warning(f"❌ {skill}")
+        
+        st.markdown("""
+        **Suggested Learning Resources:**
+        - Structured online courses
+        - Industry certifications
+        - Hands-on projects
+        - Mentorship programs
+        """)
+    
+    st.divider()
+    
+    # Learning plan
+    st.markdown("### 📚 Your Personalized Learning Plan")
+    
+    if len(gaps) > 0:
+        timeline_tabs = st.tabs(['6-Month Plan', '12-Month Plan', '18-Month Plan'])
+        
+        with timeline_tabs[0]:
+            st.markdown(f"""
+            **Intensive Fast-Track ({len(gaps)} skills)**
+            
+            - **Month 1-2:** Online courses in top 2 priorities
+            - **Month 2-3:** Parallel learning + side projects
+            - **Month 4-5:** Advanced applications + portfolio
+            - **Month 6:** Interview prep + job search
+            """)
+        
+        with timeline_tabs[1]:
+            st.markdown(f"""
+            **Balanced Approach ({len(gaps)} skills)**
+            
+            - **Months 1-3:** Foundational knowledge
+            - **Months 4-6:** Intermediate projects
+            - **Months 7-9:** Advanced concepts
+            - **Months 10-12:** Specialization + job search
+            """)
+        
+        with timeline_tabs[2]:
+            st.markdown(f"""
+            **Comprehensive Development ({len(gaps)} skills)**
+            
+            - **Months 1-5:** Deep foundational learning
+            - **Months 6-10:** Industry-level projects
+            - **Months 11-15:** Expertise development
+            - **Months 16-18:** Leadership/mentoring + job search
+            """)
+    
+    st.divider()
+    
+    # Real-world scenarios
+    st.markdown("### 💼 Real-World Transition Scenarios")
+    
+    scenarios = {
+        "Teacher → L&D": """
+        **Example: "I'm a teacher wanting to move into L&D or HR"**
+        
+        **Your Advantages:** Training experience, curriculum design, learner psychology
+        **Skills to Develop:** Learning technologies, corporate culture, compliance training
+        **Timeline:** 6-12 months
+        **First Roles:** Instructional Designer, Training Coordinator, Learning Content Creator
+        """,
+        "Project Engineer → Cloud Engineer": """
+        **Example: "I'm a project engineer aiming for cloud engineering"**
+        
+        **Your Advantages:** Project management, infrastructure planning, systems thinking
+        **Skills to Develop:** Cloud platforms (AWS/Azure), containerization, automation
+        **Timeline:** 9-15 months
+        **First Roles:** Cloud Operations, Infrastructure Support, DevOps Intern-level
+        """,
+        "Operations → Product Management": """
+        **Example: "I want to move from operations to product management"**
+        
+        **Your Advantages:** Process optimization, business acumen, stakeholder management
+        **Skills to Develop:** Product strategy, user research, data analytics
+        **Timeline:** 12-18 months
+        **First Roles:** Product Analyst, Associate Product Manager
+        """
+    }
+    
+    selected_scenario = st.selectbox(
+        "Select a relevant scenario:",
+        options=list(scenarios.keys())
+    )
+    profiler.record_inputs(selected_scenario=selected_scenario)
+    
+    st.info(scenarios[selected_scenario])
+    
+    st.divider()
+    
+    # Action plan
+    st.markdown("### ✨ Your Action Plan (Next 30 Days)")
+    
+    actions = [
+        ("📚", "Research Phase", "Study job postings, talk to people in target role"),
+        ("🎯", "Skill Assessment", "Identify top 3 skills to prioritize"),
+        ("📝", "Create Learning Plan", "Enroll in courses, find resources"),
+        ("🤝", "Start Networking", "Connect with professionals in target field"),
+        ("💼", "Build Portfolio", "Start small projects showcasing transition skills")
+    ]
+    
+    for emoji, action, detail in actions:
+        st.success(f"{emoji} **{action}**\n\n{detail}")
 
 # ============================================================================
 # MAIN APP
 # ============================================================================
 def main():
     # Load data
-    df = load_data()
+    engine = load_engine(snapshot.snapshot_version() or 'csv')
     
-    if df is None:
+    if engine is None:
         st.error("Failed to load data. Please check the CSV file.")
         return
     
     # ========================================================================
     # SIDEBAR - Navigation and Filters
     # ========================================================================
+    admin = is_admin()
     st.sidebar.markdown("## 🎯 Navigation")
     app_mode = st.sidebar.radio(
         "Select Your Journey:",
@@ -197,13 +933,31 @@ def main():
             "🔄 Career Switcher",
             "📊 My Career Profile",
             "💡 Usage Guide"
-        ]
+        ] + (["🩺 Slow Runs"] if admin else [])
     )
+    profiler.record_inputs(page=app_mode)
+    
+    _full_run.active = True
+    try:
+        with metrics.span('page', page=app_mode, run='full'):
+            render_page(engine, app_mode)
+    finally:
+        _full_run.active = False
     
+    if admin:
+        metrics_panel(engine)
+    export_metrics()
+
+def render_page(engine, app_mode):
+    """Render the selected page"""
     # ========================================================================
     # PAGE 1: HOME & OVERVIEW
     # ========================================================================
     if app_mode == "🏠 Home & Overview":
+        import plotly.express as px
+        import plotly.graph_objects as go
+        cube = engine.cube
+        
         st.markdown("""
         <div style='text-align: center; padding: 40px;'>
             <h1>🎯 Career Path & Skills Gap Analyzer</h1>
@@ -220,19 +974,19 @@ def main():
         with col1:
             st.metric(
                 label="Job Postings Analyzed",
-                value=f"{len(df):,}",
+                value=f"{cube.total_count:,}",
                 delta="Real-time data"
             )
         
         with col2:
             st.metric(
                 label="Career Categories",
-                value=df['primary_category'].nunique(),
+                value=len(cube.category_counts()),
                 delta="Diverse opportunities"
             )
         
         with col3:
-            avg_salary = df['average_salary'].mean()
+            avg_salary = cube.avg_salary
             st.metric(
                 label="Avg Salary Range",
                 value=f"${avg_salary:,.0f}/month",
@@ -252,6 +1006,7 @@ def main():
                 "Career Switcher"
             ]
         )
+        profiler.record_inputs(user_type=user_type)
         
         st.markdown(f"""
         <div class='insight-box'>
@@ -268,7 +1023,7 @@ def main():
         
         with col1:
             # Top categories by job count
-            top_categories = df['primary_category'].value_counts().head(8)
+            top_categories = cube.category_counts().head(8)
             fig = px.bar(
                 x=top_categories.values,
                 y=top_categories.index,
@@ -277,11 +1032,11 @@ def main():
                 labels={'x': 'Number of Postings', 'y': 'Industry'}
             )
             fig.update_layout(height=400, template="plotly_white")
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig)
         
         with col2:
             # Experience requirements distribution
-            exp_dist = df[df['minimumYearsExperience'] <= 20].groupby(pd.cut(df['minimumYearsExperience'], bins=[0, 2, 5, 10, 20])).size()
+            exp_dist = cube.experience_histogram(bins=[0, 2, 5, 10, 20], max_years=20)
             fig = go.Figure(data=[
                 go.Bar(
                     x=['0-2 years', '2-5 years', '5-10 years', '10-20 years'],
@@ -296,11 +1051,11 @@ def main():
                 height=400,
                 template="plotly_white"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig)
         
         # Salary insights by experience
         st.markdown("### 💰 Salary Trends by Experience")
-        salary_by_exp = df[df['minimumYearsExperience'] <= 15].groupby(pd.cut(df['minimumYearsExperience'], bins=6))['average_salary'].agg(['mean', 'count'])
+        salary_by_exp = cube.salary_by_experience(bins=6, max_years=15)
         salary_by_exp.index = [f"{int(interval.left)}-{int(interval.right)}y" for interval in salary_by_exp.index]
         
         fig = px.line(
@@ -311,7 +1066,7 @@ def main():
             labels={'x': 'Years of Experience', 'y': 'Average Monthly Salary ($)'}
         )
         fig.update_layout(height=400, template="plotly_white")
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig)
     
     # ========================================================================
     # PAGE 2: MID-CAREER PROFESSIONAL
@@ -326,251 +1081,7 @@ def main():
         
         st.divider()
         
-        # User Input Section
-        st.markdown("### 📝 Your Current Profile")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            current_role = st.selectbox(
-                "Your Current Role/Title:",
-                options=['QA Engineer', 'Software Engineer', 'Data Analyst', 'Product Manager', 
-                        'Business Analyst', 'DevOps Engineer', 'Solution Architect', 'Other']
-            )
-        
-        with col2:
-            years_exp = st.slider(
-                "Years of Experience:",
-                min_value=3, max_value=20, value=5, step=1
-            )
-        
-        with col3:
-            current_salary = st.number_input(
-                "Current Monthly Salary ($):",
-                min_value=2000, max_value=15000, value=5000, step=500
-            )
-        
-        st.divider()
-        
-        # Current skills
-        st.markdown("### 🛠️ Your Current Skills")
-        col1, col2 = st.columns(2)
-        
-        all_skills = ['Python', 'Java', 'SQL', 'AWS', 'Azure', 'Docker', 'Kubernetes', 
-                     'JavaScript', 'React', 'Node.js', 'Machine Learning', 'Data Science',
-                     'Project Management', 'Leadership', 'Agile', 'Communication']
-        
-        with col1:
-            current_skills = st.multiselect(
-                "Select skills you currently have:",
-                options=all_skills,
-                default=all_skills[:3]
-            )
-        
-        with col2:
-            proficiency_levels = {}
-            st.write("**Proficiency Level:**")
-            for skill in current_skills:
-                proficiency_levels[skill] = st.select_slider(
-                    f"{skill}:",
-                    options=['Beginner', 'Intermediate', 'Advanced', 'Expert'],
-                    value='Intermediate',
-                    key=f"prof_{skill}"
-                )
-        
-        st.divider()
-        
-        # Career goals
-        st.markdown("### 🎯 Your Career Goals")
-        career_goal = st.selectbox(
-            "What's your primary career goal?",
-            options=[
-                "Promotion within current role",
-                "Transition to higher-level role",
-                "Domain/technology shift",
-                "Leadership track",
-                "Specialist/Expert track"
-            ]
-        )
-        
-        target_role = st.text_input(
-            "Target role (e.g., 'Senior SDET', 'Team Lead', 'Product Manager'):",
-            value="Senior " + current_role
-        )
-        
-        st.divider()
-        
-        # Analysis
-        if st.button("🔍 Analyze My Career Path", type="primary", use_container_width=True):
-            with st.spinner("Analyzing job market and identifying opportunities..."):
-                
-                # Filter relevant roles
-                role_filter_df = df[df['title'].str.contains(current_role, case=False, na=False)]
-                target_filter_df = df[df['title'].str.contains(target_role, case=False, na=False)]
-                
-                # Create analysis columns
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("### 📊 Current Role Market Analysis")
-                    
-                    if len(role_filter_df) > 0:
-                        current_stats = {
-                            'Avg Experience Required': role_filter_df['minimumYearsExperience'].mean(),
-                            'Avg Salary': role_filter_df['average_salary'].mean(),
-                            'Salary Range': f"${role_filter_df['salary_minimum'].mean():,.0f} - ${role_filter_df['salary_maximum'].mean():,.0f}"
-                        }
-                        
-                        st.metric("Number of Openings", value=len(role_filter_df))
-                        st.metric("Average Salary", value=f"${current_stats['Avg Salary']:,.0f}/month")
-                        st.metric("Avg Exp Required", value=f"{current_stats['Avg Experience Required']:.1f} years")
-                    else:
-                        st.info("Limited data for exact role match. Showing related opportunities...")
-                
-                with col2:
-                    st.markdown("### 🎯 Target Role Market Analysis")
-                    
-                    if len(target_filter_df) > 0:
-                        target_stats = {
-                            'Avg Experience Required': target_filter_df['minimumYearsExperience'].mean(),
-                            'Avg Salary': target_filter_df['average_salary'].mean(),
-                            'Salary Range': f"${target_filter_df['salary_minimum'].mean():,.0f} - ${target_filter_df['salary_maximum'].mean():,.0f}"
-                        }
-                        
-                        st.metric("Number of Openings", value=len(target_filter_df))
-                        st.metric("Average Salary", value=f"${target_stats['Avg Salary']:,.0f}/month")
-                        st.metric("Avg Exp Required", value=f"{target_stats['Avg Experience Required']:.1f} years")
-                        
-                        # Salary jump calculation
-                        salary_jump = target_stats['Avg Salary'] - current_salary
-                        jump_percentage = (salary_jump / current_salary * 100) if current_salary > 0 else 0
-                        st.success(f"💰 Potential Salary Jump: ${salary_jump:,.0f}/month ({jump_percentage:.1f}%)")
-                    else:
-                        st.warning("Limited data for target role. Try a different target.")
-                
-                st.divider()
-                
-                # Skills gap analysis
-                st.markdown("### 🔍 Skills Gap Analysis")
-                
-                # Extract skills from job titles
-                current_job_skills = set()
-                target_job_skills = set()
-                
-                for title in role_filter_df['title'].head(20):
-                    current_job_skills.update(extract_skills_from_title(title))
-                
-                for title in target_filter_df['title'].head(20):
-                    target_job_skills.update(extract_skills_from_title(title))
-                
-                user_skills_set = set(current_skills)
-                gaps = target_job_skills - user_skills_set
-                overlaps = target_job_skills.intersection(user_skills_set)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("#### ✅ Skills You Already Have")
-                    if overlaps:
-                        for skill in sorted(overlaps):
-                            st.success(f"• {skill}")
-                    else:
-                        st.info("Add relevant skills to see matches")
-                
-                with col2:
-                    st.markdown("#### ❌ Skills Gap (Missing)")
-                    if gaps:
-                        st.warning(f"You're missing {len(gaps)} key skills:")
-                        for skill in sorted(gaps):
-                            st.warning(f"• {skill}")
-                    else:
-                        st.success("Great! Your skills align well with target role!")
-                
-                st.divider()
-                
-                # Upskilling roadmap
-                st.markdown("### 📚 Personalized Upskilling Roadmap")
-                
-                if gaps:
-                    st.info(f"""
-                    **Timeline Estimate:** 3-6 months to gain proficiency in {len(gaps)} key skills
-                    
-                    **Recommended Learning Path:**
-                    """)
-                    
-                    roadmap_tabs = st.tabs(['Quick Path (3 months)', 'Thorough Path (6 months)', 'Expert Path (12 months)'])
-                    
-                    with roadmap_tabs[0]:
-                        st.markdown("""
-                        Focus on the top 2-3 most impactful skills:
-                        1. **Month 1:** Online courses + hands-on projects
-                        2. **Month 2:** Build portfolio projects
-                        3. **Month 3:** Practice interview scenarios
-                        """)
-                    
-                    with roadmap_tabs[1]:
-                        st.markdown("""
-                        Balanced approach across all critical skills:
-                        1. **Months 1-2:** Core concept learning
-                        2. **Months 3-4:** Intermediate projects
-                        3. **Months 5-6:** Advanced scenarios + interviews
-                        """)
-                    
-                    with roadmap_tabs[2]:
-                        st.markdown("""
-                        Deep expertise development:
-                        1. **Months 1-4:** Strong foundational learning
-                        2. **Months 5-8:** Advanced applications
-                        3. **Months 9-12:** Expert-level projects + certifications
-                        """)
-                
-                st.divider()
-                
-                # Salary projection
-                st.markdown("### 💹 Your Salary Growth Projection")
-                
-                milestones = ['Current', 'With Key Skills (3-6mo)', 'Promoted (12mo)', 'Senior Role (24mo)']
-                projected_salaries = [
-                    current_salary,
-                    current_salary * 1.15,
-                    current_salary * 1.35,
-                    current_salary * 1.65
-                ]
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=milestones,
-                    y=projected_salaries,
-                    mode='lines+markers',
-                    fill='tozeroy',
-                    line_color='#00CC96',
-                    marker=dict(size=12),
-                    fillcolor='rgba(0, 204, 150, 0.1)'
-                ))
-                fig.update_layout(
-                    title='Your Salary Growth Projection',
-                    yaxis_title='Monthly Salary ($)',
-                    height=400,
-                    template="plotly_white",
-                    hovermode='x unified'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.divider()
-                
-                # Action items
-                st.markdown("### ✨ Recommended Next Steps")
-                
-                steps = [
-                    ("🎓", "Enroll in online courses", "Platforms: Coursera, Udemy, LinkedIn Learning"),
-                    ("💻", "Build portfolio projects", "GitHub projects showcasing your skills"),
-                    ("🤝", "Network in your target domain", "LinkedIn, meetups, conferences"),
-                    ("📝", "Update your resume", "Highlight transferable skills"),
-                    ("🗣️", "Practice interviews", "Focus on behavioral + technical questions")
-                ]
-                
-                for emoji, step, detail in steps:
-                    st.info(f"{emoji} **{step}**\n\n{detail}")
+        mid_career_section(engine)
     
     # ========================================================================
     # PAGE 3: CAREER SWITCHER
@@ -585,266 +1096,14 @@ def main():
         
         st.divider()
         
-        st.markdown("### 📝 Your Current Background")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            current_domain = st.selectbox(
-                "Your Current Domain/Field:",
-                options=['Engineering', 'Operations', 'Teaching/Education', 'Sales/Business Development',
-                        'Finance', 'Government/Public Service', 'Hospitality', 'Healthcare',
-                        'Manufacturing', 'Consulting', 'Other']
-            )
-            
-            current_years = st.slider(
-                "Years in Current Field:",
-                min_value=1, max_value=30, value=5, step=1
-            )
-        
-        with col2:
-            target_domain = st.selectbox(
-                "Target Domain/Field:",
-                options=['Product Management', 'Data Science', 'Cloud Engineering', 
-                        'Learning & Development (L&D)', 'HR/People Operations', 'Software Engineering',
-                        'Project Management', 'Business Analysis', 'UX/UI Design', 'Other']
-            )
-        
-        st.divider()
-        
-        st.markdown("### 🛠️ Your Transferable Skills")
-        
-        transferable_skills = st.multiselect(
-            "Select skills you have that transfer across domains:",
-            options=['Project Management', 'Communication', 'Leadership', 'Problem Solving',
-                    'Data Analysis', 'Training/Teaching', 'Customer Relations', 'Strategic Thinking',
-                    'Process Improvement', 'Technical Writing', 'Agile Methodology', 'Attention to Detail'],
-            default=['Communication', 'Problem Solving']
-        )
-        
-        st.divider()
-        
-        if st.button("🔍 Analyze My Transition Path", type="primary", use_container_width=True):
-            with st.spinner("Analyzing career transition opportunities..."):
-                
-                st.markdown("### 📊 Transition Feasibility Analysis")
-                
-                # Find roles that match skills
-                domain_roles_df = df[df['title'].str.contains(target_domain, case=False, na=False)]
-                
-                # Calculate transition difficulty
-                transition_difficulty = "Moderate"
-                difficulty_color = "🟡"
-                
-                if len(domain_roles_df) > 0:
-                    avg_exp_target = domain_roles_df['minimumYearsExperience'].mean()
-                    
-                    if current_years >= avg_exp_target * 0.5:
-                        transition_difficulty = "Low-Moderate"
-                        difficulty_color = "🟢"
-                    elif current_years >= avg_exp_target * 0.3:
-                        transition_difficulty = "Moderate"
-                        difficulty_color = "🟡"
-                    else:
-                        transition_difficulty = "Challenging"
-                        difficulty_color = "🔴"
-                
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("Transition Difficulty", value=transition_difficulty)
-                
-                with col2:
-                    st.metric("Target Domain Openings", value=len(domain_roles_df))
-                
-                with col3:
-                    if len(domain_roles_df) > 0:
-                        st.metric("Avg Salary (Target)", f"${domain_roles_df['average_salary'].mean():,.0f}")
-                
-                st.divider()
-                
-                # Transition paths
-                st.markdown("### 🗺️ Recommended Transition Paths")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("#### Path 1: Direct Transition (Fast Track)")
-                    st.markdown("""
-                    **Timeline:** 6-12 months
-                    
-                    **Steps:**
-                    1. Identify overlapping skills
-                    2. Fill critical knowledge gaps
-                    3. Build portfolio/projects in new domain
-                    4. Network and find mentors
-                    5. Apply to entry/junior roles in new domain
-                    
-                    **Best for:** Strong foundational skills + dedicated learning
-                    """)
-                
-                with col2:
-                    st.markdown("#### Path 2: Gradual Transition (Stepping Stone)")
-                    st.markdown("""
-                    **Timeline:** 18-24 months
-                    
-                    **Steps:**
-                    1. Find intermediate roles combining both domains
-                    2. Build experience in new domain part-time
-                    3. Develop new domain expertise gradually
-                    4. Transition full-time with hybrid background
-                    5. Leverage unique perspective as competitive advantage
-                    
-                    **Best for:** Risk mitigation + stable income
-                    """)
-                
-                st.divider()
-                
-                # Skills gap for transition
-                st.markdown("### 🎯 Critical Skills You Need")
-                
-                if target_domain == "Data Science":
-                    required_skills = ['Python', 'SQL', 'Machine Learning', 'Statistics', 'Data Visualization']
-                elif target_domain == "Product Management":
-                    required_skills = ['Product Strategy', 'User Research', 'Data Analysis', 'Communication', 'Leadership']
-                elif target_domain == "Cloud Engineering":
-                    required_skills = ['AWS/Azure/GCP', 'DevOps', 'Containerization', 'Infrastructure as Code', 'System Design']
-                elif target_domain == "Learning & Development (L&D)":
-                    required_skills = ['Instructional Design', 'Learning Technologies', 'Training Facilitation', 'Adult Learning Theory']
-                else:
-                    required_skills = ['Technical Skills', 'Domain Knowledge', 'Industry Standards']
-                
-                # Identify skill gaps
-                gaps = [s for s in required_skills if s not in transferable_skills]
-                matches = [s for s in required_skills if s in transferable_skills]
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.success(f"**Your Advantages ({len(matches)} matches):**")
-                    if matches:
-                        for skill in matches:
-                            st.success(f"✅ {skill}")
-                    
-                    st.markdown("""
-                    **Leverage your transferable skills in:**
-                    - Team collaboration and communication
-                    - Project delivery and management
-                    - Cross-functional work
-                    - Understanding business needs
-                    """)
-                
-                with col2:
-                    st.warning(f"**Skills to Develop ({len(gaps)} gaps):**")
-                    if gaps:
-                        for skill in gaps:
-                            st.warning(f"❌ {skill}")
-                    
-                    st.markdown("""
-                    **Suggested Learning Resources:**
-                    - Structured online courses
-                    - Industry certifications
-                    - Hands-on projects
-                    - Mentorship programs
-                    """)
-                
-                st.divider()
-                
-                # Learning plan
-                st.markdown("### 📚 Your Personalized Learning Plan")
-                
-                if len(gaps) > 0:
-                    timeline_tabs = st.tabs(['6-Month Plan', '12-Month Plan', '18-Month Plan'])
-                    
-                    with timeline_tabs[0]:
-                        st.markdown(f"""
-                        **Intensive Fast-Track ({len(gaps)} skills)**
-                        
-                        - **Month 1-2:** Online courses in top 2 priorities
-                        - **Month 2-3:** Parallel learning + side projects
-                        - **Month 4-5:** Advanced applications + portfolio
-                        - **Month 6:** Interview prep + job search
-                        """)
-                    
-                    with timeline_tabs[1]:
-                        st.markdown(f"""
-                        **Balanced Approach ({len(gaps)} skills)**
-                        
-                        - **Months 1-3:** Foundational knowledge
-                        - **Months 4-6:** Intermediate projects
-                        - **Months 7-9:** Advanced concepts
-                        - **Months 10-12:** Specialization + job search
-                        """)
-                    
-                    with timeline_tabs[2]:
-                        st.markdown(f"""
-                        **Comprehensive Development ({len(gaps)} skills)**
-                        
-                        - **Months 1-5:** Deep foundational learning
-                        - **Months 6-10:** Industry-level projects
-                        - **Months 11-15:** Expertise development
-                        - **Months 16-18:** Leadership/mentoring + job search
-                        """)
-                
-                st.divider()
-                
-                # Real-world scenarios
-                st.markdown("### 💼 Real-World Transition Scenarios")
-                
-                scenarios = {
-                    "Teacher → L&D": """
-                    **Example: "I'm a teacher wanting to move into L&D or HR"**
-                    
-                    **Your Advantages:** Training experience, curriculum design, learner psychology
-                    **Skills to Develop:** Learning technologies, corporate culture, compliance training
-                    **Timeline:** 6-12 months
-                    **First Roles:** Instructional Designer, Training Coordinator, Learning Content Creator
-                    """,
-                    "Project Engineer → Cloud Engineer": """
-                    **Example: "I'm a project engineer aiming for cloud engineering"**
-                    
-                    **Your Advantages:** Project management, infrastructure planning, systems thinking
-                    **Skills to Develop:** Cloud platforms (AWS/Azure), containerization, automation
-                    **Timeline:** 9-15 months
-                    **First Roles:** Cloud Operations, Infrastructure Support, DevOps Intern-level
-                    """,
-                    "Operations → Product Management": """
-                    **Example: "I want to move from operations to product management"**
-                    
-                    **Your Advantages:** Process optimization, business acumen, stakeholder management
-                    **Skills to Develop:** Product strategy, user research, data analytics
-                    **Timeline:** 12-18 months
-                    **First Roles:** Product Analyst, Associate Product Manager
-                    """
-                }
-                
-                selected_scenario = st.selectbox(
-                    "Select a relevant scenario:",
-                    options=list(scenarios.keys())
-                )
-                
-                st.info(scenarios[selected_scenario])
-                
-                st.divider()
-                
-                # Action plan
-                st.markdown("### ✨ Your Action Plan (Next 30 Days)")
-                
-                actions = [
-                    ("📚", "Research Phase", "Study job postings, talk to people in target role"),
-                    ("🎯", "Skill Assessment", "Identify top 3 skills to prioritize"),
-                    ("📝", "Create Learning Plan", "Enroll in courses, find resources"),
-                    ("🤝", "Start Networking", "Connect with professionals in target field"),
-                    ("💼", "Build Portfolio", "Start small projects showcasing transition skills")
-                ]
-                
-                for emoji, action, detail in actions:
-                    st.success(f"{emoji} **{action}**\n\n{detail}")
+        transition_section(engine)
     
     # ========================================================================
     # PAGE 4: MY CAREER PROFILE
     # ========================================================================
     elif app_mode == "📊 My Career Profile":
+        import plotly.express as px
+        import plotly.graph_objects as go
         st.markdown("## 📊 Your Personalized Career Profile")
         st.markdown("Build and track your career profile with real-time job market insights.")
         
@@ -861,7 +1120,7 @@ def main():
         
         with col2:
             education = st.selectbox("Highest Education:", ["Diploma", "Bachelor's", "Master's", "PhD"])
-            industry = st.selectbox("Current Industry:", df['primary_category'].unique()[:10])
+            industry = st.selectbox("Current Industry:", engine.categories()[:10])
             location = st.text_input("Location:", "Singapore")
             availability = st.selectbox("Job Search Status:", ["Open to Opportunities", "Passive", "Not Looking"])
         
@@ -876,6 +1135,10 @@ def main():
         )
         
         skills_list = [s.strip() for s in skills_input.split(',') if s.strip()]
+        profiler.record_inputs(
+            role=role, years=years, salary=salary, education=education, industry=industry,
+            availability=availability, skills=skills_list
+        )
         
         st.divider()
         
@@ -883,13 +1146,14 @@ def main():
         st.markdown("### 📈 Your Market Position")
         
         if role:
-            matching_roles = df[df['title'].str.contains(role, case=False, na=False)]
+            role = resolve_role_input(engine, role)
+            peer_stats = engine.role_stats(role)
             
-            if len(matching_roles) > 0:
+            if peer_stats:
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    peer_salary = matching_roles['average_salary'].median()
+                    peer_salary = peer_stats['median_salary']
                     salary_diff = salary - peer_salary
                     st.metric(
                         "Peer Median Salary",
@@ -898,7 +1162,7 @@ def main():
                     )
                 
                 with col2:
-                    peer_exp = matching_roles['minimumYearsExperience'].median()
+                    peer_exp = peer_stats['median_experience']
                     st.metric(
                         "Typical Experience",
                         f"{peer_exp:.1f} years",
@@ -908,18 +1172,55 @@ def main():
                 with col3:
                     st.metric(
                         "Job Openings",
-                        f"{len(matching_roles):,}",
+                        f"{peer_stats['count']:,}",
                         "Active market"
                     )
                 
+                # Salary quantiles from the per-role / category / experience sketches
+                st.markdown("### 💵 Salary Bands")
+                
+                segments = [
+                    (f"{role} (all)", engine.salary_bands(role)),
+                    (f"{role} in {industry}", engine.salary_bands(role, category=industry)),
+                    (f"{role}, {engine.experience_level(years)}", engine.salary_bands(role, years=years)),
+                    (f"All roles in {industry}", engine.salary_bands(category=industry)),
+                ]
+                segments = [(label, bands) for label, bands in segments if bands]
+                
+                if segments:
+                    labels = [label for label, _ in segments]
+                    fig = go.Figure()
+                    for low, high, name, opacity in ((0.1, 0.9, 'p10 – p90', 0.35), (0.25, 0.75, 'p25 – p75', 0.8)):
+                        fig.add_trace(go.Bar(
+                            y=labels,
+                            x=[bands[high] - bands[low] for _, bands in segments],
+                            base=[bands[low] for _, bands in segments],
+                            orientation='h',
+                            name=name,
+                            marker_color='#636EFA',
+                            opacity=opacity
+                        ))
+                    fig.add_trace(go.Scatter(
+                        y=labels,
+                        x=[bands[0.5] for _, bands in segments],
+                        mode='markers',
+                        name='Median',
+                        marker=dict(color='#EF553B', size=12, symbol='line-ns-open', line_width=3)
+                    ))
+                    fig.add_vline(x=salary, line_dash='dash', line_color='#00CC96', annotation_text='You')
+                    fig.update_layout(
+                        title='Monthly Salary Percentiles',
+                        xaxis_title='Monthly Salary ($)',
+                        barmode='overlay',
+                        height=350,
+                        template="plotly_white"
+                    )
+                    show_chart(fig)
+                
                 # Radar chart for skill requirements
                 st.markdown("### 📊 Typical Skills for Your Role")
                 
-                from_titles = []
-                for title in matching_roles['title'].head(50):
-                    from_titles.extend(extract_skills_from_title(title))
-                
-                skill_counts = Counter(from_titles)
+                skill_counts = engine.role_skills(role)
                 top_skills = dict(skill_counts.most_common(8))
                 
                 if top_skills:
@@ -931,7 +1232,31 @@ def main():
                         labels={'x': 'Frequency', 'y': 'Skill'}
                     )
                     fig.update_layout(height=400, template="plotly_white")
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_chart(fig)
+        
+        st.divider()
+        
+        # Every posting in the market scored against the entered skills
+        st.markdown("### 🧭 Best-Fit Roles for Your Skills")
+        
+        best_fit = engine.best_fit_roles(skills_list, top_k=10)
+        
+        if best_fit:
+            st.dataframe(
+                pd.DataFrame([{
+                    'Role': engine.display_name(fit['role']),
+                    'Skill Match': f"{fit['match']:.0f}%",
+                    'Openings': fit['postings'],
+                    'Full Matches': fit['full_match_postings'],
+                    'Avg Salary': f"${fit['avg_salary']:,.0f}",
+                    'Skills to Add': ', '.join(fit['skills_to_add']) or '—'
+                } for fit in best_fit]),
+                hide_index=True, use_container_width=True
+            )
+            st.caption(f"Roles with at least {config.MIN_JOB_POSTINGS_THRESHOLD} postings requiring any of the "
+                       "tracked skills, ranked by average skill match across those postings.")
+        else:
+            st.info("None of the entered skills appear in current job postings. Try adding more skills.")
     
     # ========================================================================
     # PAGE 5: USAGE GUIDE
@@ -1225,5 +1550,13 @@ def main():
         **Good luck with your career journey! 🚀**
         """)
 
+    # ========================================================================
+    # ADMIN: SLOW RUNS
+    # ========================================================================
+    elif app_mode == "🩺 Slow Runs":
+        slow_runs_page()
+        import_budget_panel()
+
 if __name__ == "__main__":
-    main()
+    with slow_run_capture():
+        main()
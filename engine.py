@@ -0,0 +1,376 @@
+"""
+Career Analytics Engine
+Single owner of the job data, its indexes and caches, exposing the analyzer
+operations used by the dashboard pages and offline tools
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+import config
+import ingest
+import metrics
+import snapshot
+from utilities import (
+    CareerPathAnalyzer, DataProcessor, FuzzyTitleIndex, MarketAnalyzer, MarketCube, RoleCube,
+    RoleRecommender, RoleStatsCache, SalarySketch, SkillIndex, SkillsAnalyzer, TitleIndex, TransitionGraph, TransitionPathFinder,
+    preprocessing_pool, preprocessing_workers
+)
+
+
+class CareerEngine:
+    """Loaded job data plus lazily built indexes, shared by every caller
+
+    Indexes are read from the snapshot when available and built on first use
+    otherwise. The engine never mutates its frame, so one instance can be
+    shared across threads and Streamlit sessions.
+    
+    In streaming mode (`df` is None) the engine holds only the MarketCube,
+    RoleCube and SalarySketch aggregates, and every page query is answered from them.
+    """
+
+    def __init__(self, df, data_version='memory', snapshot_dir=None):
+        self.df = df
+        self.data_version = data_version
+        self.snapshot_dir = snapshot_dir
+        self.role_stats_cache = RoleStatsCache(
+            maxsize=config.ROLE_STATS_CACHE_SIZE, ttl=config.CACHE_TTL,
+            on_lookup=lambda hit: metrics.inc('cache_lookups_total', cache='role_stats', result='hit' if hit else 'miss')
+        )
+        self._indexes = {}
+        self._lock = threading.RLock()  # Index builds may use other indexes
+
+    # ------------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------------
+    @classmethod
+    def from_snapshot(cls, snapshot_dir=config.SNAPSHOT_DIR, compact=config.COMPACT_FRAME):
+        """Engine over a Parquet snapshot built by snapshot.py"""
+        columns = DataProcessor.COMPACT_COLUMNS if compact else None
+        with metrics.span('load', source='snapshot'):
+            df = snapshot.load_snapshot(snapshot_dir, columns=columns)
+            if compact:
+                df = DataProcessor.compact_frame(df)
+        return cls(df, snapshot.snapshot_version(snapshot_dir), snapshot_dir)
+
+    @classmethod
+    def from_csv(cls, csv_path=config.DATA_FILE, compact=config.COMPACT_FRAME, quarantine_path=None,
+                 workers=config.PREPROCESS_WORKERS):
+        """Engine over a raw CSV, cleaned on load
+        
+        Category parsing and skill extraction run on `workers` processes
+        (serial by default, see config.PREPROCESS_WORKERS).
+        """
+        with metrics.span('load', source='csv'):
+            raw, _ = ingest.read_job_csv(csv_path, quarantine_path=quarantine_path)
+            workers = preprocessing_workers(workers, rows=len(raw))
+            with preprocessing_pool(workers) as executor:
+                df = DataProcessor.process_data(raw, executor=executor, workers=workers)
+                skill_index = SkillIndex.build(df['title'], executor=executor, workers=workers)
+            if compact:
+                df = DataProcessor.compact_frame(df)
+        
+        engine = cls(df, f'csv:{csv_path}')
+        engine._indexes['skills'] = skill_index
+        return engine
+
+    @classmethod
+    def from_csv_stream(cls, csv_path=config.DATA_FILE, block_size=config.STREAM_BLOCK_SIZE, quarantine_path=None):
+        """Aggregate-only engine over a CSV of any size, read block by block"""
+        with metrics.span('load', source='stream'):
+            cube, role_cube, salaries, _ = ingest.aggregate_job_csv(csv_path, quarantine_path, block_size)
+        engine = cls(None, f'stream:{csv_path}')
+        engine._indexes.update(cube=cube, roles=role_cube, salaries=salaries)
+        return engine
+    
+    @classmethod
+    def load(cls, snapshot_dir=config.SNAPSHOT_DIR, csv_path=config.DATA_FILE, streaming=config.STREAMING_MODE):
+        """Engine over the snapshot if one exists, otherwise over the CSV"""
+        if snapshot.snapshot_exists(snapshot_dir):
+            return cls.from_snapshot(snapshot_dir)
+        if streaming:
+            return cls.from_csv_stream(csv_path)
+        return cls.from_csv(csv_path)
+    
+    @property
+    def streaming(self):
+        return self.df is None
+
+    def _index(self, name, build):
+        """Return a named index, building it once under the lock"""
+        if name not in self._indexes:
+            with self._lock:
+                if name not in self._indexes:
+                    with metrics.span('index', index=name):
+                        self._indexes[name] = build()
+        return self._indexes[name]
+
+    # ------------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------------
+    @property
+    def title_index(self):
+        return self._index('title', lambda: TitleIndex(self.df['title']))
+
+    @property
+    def skill_index(self):
+        def build():
+            skill_index = None
+            if self.snapshot_dir:
+                skill_index = snapshot.load_skill_index(self.snapshot_dir)
+            if skill_index is None or len(skill_index) != len(self.df):
+                skill_index = SkillIndex.build(self.df['title'])
+            return skill_index
+        return self._index('skills', build)
+
+    @property
+    def cube(self):
+        def build():
+            cube = snapshot.load_cube(self.snapshot_dir) if self.snapshot_dir else None
+            if cube is None or cube.total_count != len(self.df):
+                cube = MarketCube.build(self.df)
+            return cube
+        return self._index('cube', build)
+    
+    @property
+    def role_cube(self):
+        return self._index('roles', lambda: RoleCube.build(self.df))
+
+    @property
+    def graph(self):
+        def build():
+            graph = snapshot.load_transition_graph(self.snapshot_dir) if self.snapshot_dir else None
+            if graph is None and self.streaming:
+                graph = self.role_cube.transition_graph(
+                    min_postings=config.MIN_JOB_POSTINGS_THRESHOLD,
+                    max_neighbors=config.TRANSITION_MAX_NEIGHBORS
+                )
+            if graph is None:
+                graph = TransitionGraph.build(
+                    self.df, self.skill_index,
+                    min_postings=config.MIN_JOB_POSTINGS_THRESHOLD,
+                    max_neighbors=config.TRANSITION_MAX_NEIGHBORS
+                )
+            return graph
+        return self._index('graph', build)
+
+    @property
+    def fuzzy_index(self):
+        def build():
+            fuzzy_index = snapshot.load_fuzzy_index(self.snapshot_dir) if self.snapshot_dir else None
+            if fuzzy_index is None and self.streaming:
+                roles = self.role_cube.roles
+                fuzzy_index = FuzzyTitleIndex.build(list(roles.index), roles['count'].to_numpy())
+            if fuzzy_index is None:
+                fuzzy_index = FuzzyTitleIndex.from_postings(self.df['title'])
+            return fuzzy_index
+        return self._index('fuzzy', build)
+
+    @property
+    def display_names(self):
+        """({normalized title: most posted spelling}, {lowercase word: most posted spelling})"""
+        def build():
+            if self.streaming:
+                return {}, {}
+            titles, words = {}, {}
+            counts = self.df['title'].value_counts()
+            for title in counts[counts > 0].index:
+                title = ' '.join(str(title).split())
+                titles.setdefault(title.lower(), title)
+                for word in title.split():
+                    words.setdefault(word.lower(), word)
+            return titles, words
+        return self._index('display_names', build)
+
+    @property
+    def salary_sketch(self):
+        def build():
+            sketch = snapshot.load_salary_sketch(self.snapshot_dir) if self.snapshot_dir else None
+            if sketch is None or sketch.total_count != len(self.df):
+                sketch = SalarySketch.build(self.df, config.EXPERIENCE_LEVELS)
+            return sketch
+        return self._index('salaries', build)
+
+    @property
+    def recommender(self):
+        def build():
+            if self.streaming:
+                return RoleRecommender.from_role_cube(self.role_cube)
+            return RoleRecommender.build(self.df, self.skill_index)
+        return self._index('recommender', build)
+
+    # ------------------------------------------------------------------------
+    # Roles
+    # ------------------------------------------------------------------------
+    def role_rows(self, role_keyword):
+        """Row positions of postings whose title contains role_keyword"""
+        return self.title_index.search(role_keyword)
+
+    def role_keys(self, role_keyword):
+        """Roles of the postings matching role_keyword, as the graph and salary sketch name them
+        
+        These are the canonical roles when the frame has them (snapshot.py) and
+        the normalized titles otherwise, so "Staff Nurse" finds the postings
+        clustered under any canonical role.
+        """
+        if self.streaming:
+            return list(self.role_cube.find_roles(role_keyword))
+        rows = self.role_rows(role_keyword)
+        if 'canonical_role' in self.df.columns:
+            return list(pd.unique(np.asarray(self.df['canonical_role'].to_numpy(dtype=object)[rows])))
+        return sorted({TitleIndex.normalize(title) for title in pd.unique(self.df['title'].to_numpy()[rows])})
+
+    def has_postings(self, role_keyword):
+        """Whether any posting title contains role_keyword"""
+        if self.streaming:
+            return len(self.role_cube.find_roles(role_keyword)) > 0
+        return len(self.role_rows(role_keyword)) > 0
+
+    @metrics.timed('engine.similar_roles')
+    def similar_roles(self, role_keyword, k=5):
+        """Closest real titles to a (possibly misspelled) role query"""
+        return self.fuzzy_index.nearest(role_keyword, k)
+
+    def canonical_role(self, title):
+        """Most common canonical role of the postings with this (normalized) title
+        
+        None without a taxonomy or when no posting has the title.
+        """
+        if self.streaming or 'canonical_role' not in self.df.columns:
+            return None
+        rows = self.role_rows(title)
+        exact = self.df['title'].iloc[rows].map(TitleIndex.normalize) == TitleIndex.normalize(title)
+        rows = rows[exact.to_numpy(dtype=bool)]
+        if len(rows) == 0:
+            return None
+        return str(self.df['canonical_role'].iloc[rows].value_counts().index[0])
+
+    def display_name(self, role):
+        """A role or title as it is written in the postings
+        
+        Role names are lowercase keys; this returns the most posted spelling of
+        the same title, or else each word in its most posted case ("senior qa
+        engineer" -> "Senior QA Engineer"). Unknown words are kept as given.
+        """
+        titles, words = self.display_names
+        key = TitleIndex.normalize(role)
+        if key in titles:
+            return titles[key]
+        return ' '.join(words.get(word.lower(), word) for word in str(role).split())
+
+    def resolve_role(self, role_keyword):
+        """role_keyword when it matches postings, else the closest role above config.FUZZY_MIN_SIMILARITY
+        
+        The closest title is replaced by its canonical role when that name
+        matches postings itself, so the result covers the whole role rather
+        than one rare spelling of it. Returns role_keyword unchanged when
+        nothing is close enough.
+        """
+        if not role_keyword.strip() or self.has_postings(role_keyword):
+            return role_keyword
+        similar = self.similar_roles(role_keyword, k=1)
+        if not similar or similar[0]['similarity'] < config.FUZZY_MIN_SIMILARITY:
+            return role_keyword
+        title = similar[0]['role']
+        canonical = self.canonical_role(title)
+        return canonical if canonical and self.has_postings(canonical) else title
+
+    @metrics.timed('engine.role_stats')
+    def role_stats(self, role_keyword):
+        """Cached market statistics for a role (None when nothing matches)"""
+        if self.streaming:
+            return self.role_stats_cache.get_or_compute(
+                role_keyword, lambda: self.role_cube.role_stats(role_keyword)
+            )
+        return MarketAnalyzer.get_role_stats(
+            self.df, role_keyword, self.title_index, cache=self.role_stats_cache
+        )
+
+    @metrics.timed('engine.role_skills')
+    def role_skills(self, role_keyword):
+        """Skill counts over every posting for a role"""
+        if self.streaming:
+            return self.role_cube.role_skills(role_keyword)
+        return SkillsAnalyzer.get_skills_by_role(
+            self.df, role_keyword, skill_index=self.skill_index, title_index=self.title_index
+        )
+
+    @metrics.timed('engine.skill_gaps')
+    def skill_gaps(self, user_skills, role_keyword):
+        """CareerPathAnalyzer.identify_gaps against a role's skills, spelled as in the role"""
+        skills = list(self.role_skills(role_keyword))
+        names = {skill.lower(): skill for skill in skills}
+        return [names[gap] for gap in CareerPathAnalyzer.identify_gaps(user_skills, skills)]
+
+    @metrics.timed('engine.skill_match')
+    def skill_match(self, user_skills, role_keyword):
+        """Percentage of a role's skills the user already has"""
+        return CareerPathAnalyzer.calculate_skill_match(user_skills, list(self.role_skills(role_keyword)))
+
+    @metrics.timed('engine.stepping_stones')
+    def stepping_stones(self, current_role, target_role, max_gaps=3):
+        """Intermediate roles between two roles from the transition graph"""
+        # Query the graph by the roles of the matching postings rather than by name
+        return TransitionPathFinder.find_stepping_stones(
+            self.df, self.role_keys(current_role), self.role_keys(target_role), max_gaps, graph=self.graph
+        )
+
+    @metrics.timed('engine.best_fit_roles')
+    def best_fit_roles(self, user_skills, top_k=10):
+        """Roles whose postings the user's skills cover best, over the whole market"""
+        return self.recommender.best_fit_roles(
+            user_skills, top_k, min_postings=config.MIN_JOB_POSTINGS_THRESHOLD
+        )
+
+    # ------------------------------------------------------------------------
+    # Market
+    # ------------------------------------------------------------------------
+    @metrics.timed('engine.category_stats')
+    def category_stats(self, category):
+        """Statistics for an industry category"""
+        return MarketAnalyzer.get_category_stats(self.df, category, cube=self.cube)
+
+    @metrics.timed('engine.category_skills')
+    def category_skills(self, category):
+        """Top skills in an industry category"""
+        if self.streaming:
+            return self.role_cube.category_skills(category)
+        return SkillsAnalyzer.get_skills_by_category(self.df, category, skill_index=self.skill_index)
+
+    @metrics.timed('engine.salary_bands')
+    def salary_bands(self, role_keyword=None, category=None, years=None):
+        """p10 / p25 / p50 / p75 / p90 salary for any mix of role, category and experience
+        
+        Read from the salary sketches (within 1% of the exact quantiles), with
+        the role found through the sketch's own titles; None when no postings match.
+        """
+        level = None if years is None else self.experience_key(years)
+        return self.salary_sketch.quantiles(
+            SalarySketch.BANDS, role=role_keyword, category=category, experience_level=level
+        )
+
+    @metrics.timed('engine.salary_by_experience')
+    def salary_by_experience(self, max_years=15):
+        """Mean salary and posting count per experience year"""
+        return MarketAnalyzer.get_salary_by_experience(self.df, max_years, cube=self.cube)
+
+    def categories(self):
+        """Industry categories in order of first appearance"""
+        if self.streaming:
+            return self.cube.cells['primary_category'].dropna().unique()
+        return self.df['primary_category'].unique()
+    
+    @staticmethod
+    def experience_key(years):
+        """config.EXPERIENCE_LEVELS key for a number of years of experience"""
+        for level, (low, high) in config.EXPERIENCE_LEVELS.items():
+            if low <= years < high:
+                return level
+        return 'senior'
+
+    @staticmethod
+    def experience_level(years):
+        """Label for a number of years of experience (config.EXPERIENCE_LEVELS)"""
+        return config.EXPERIENCE_LABELS[CareerEngine.experience_key(years)]
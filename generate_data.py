@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+"""
+Synthetic SGJobData Generator
+Writes seeded, schema-compatible job postings for offline load tests and
+benchmarks, streaming any number of rows in fixed-size batches
+
+Usage:
+    python generate_data.py --rows 1000000 --out data/synthetic.csv
+    python generate_data.py --rows 20000000 --malformed-rate 0.001 --dirty-rate 0.01 --seed 7
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from utilities import SkillsAnalyzer
+
+COLUMNS = [
+    'title', 'categories', 'minimumYearsExperience', 'salary_minimum', 'salary_maximum',
+    'positionLevels', 'employmentTypes', 'postedCompany_name', 'status_jobStatus',
+    'metadata_totalNumberJobApplication', 'metadata_totalNumberOfView'
+]
+
+# ============================================================================
+# VOCABULARY
+# ============================================================================
+
+# Base role: (category, median monthly salary, SKILLS_DICT groups used in titles)
+ROLES = {
+    'Software Engineer': ('Information Technology', 6000, ['Programming Languages', 'Web Technologies', 'Cloud & DevOps']),
+    'QA Engineer': ('Information Technology', 4800, ['Quality & Testing', 'Programming Languages']),
+    'Data Analyst': ('Information Technology', 5000, ['Database & Data']),
+    'Data Scientist': ('Information Technology', 7000, ['Machine Learning & AI', 'Database & Data', 'Programming Languages']),
+    'DevOps Engineer': ('Information Technology', 6500, ['Cloud & DevOps']),
+    'Solution Architect': ('Information Technology', 9000, ['Systems & Architecture', 'Cloud & DevOps']),
+    'Product Manager': ('Information Technology', 8000, ['Methods & Frameworks', 'Leadership & Management']),
+    'Business Analyst': ('Banking and Finance', 5500, ['Database & Data', 'Methods & Frameworks', 'Enterprise Platforms']),
+    'Project Manager': ('Engineering', 7000, ['Leadership & Management', 'Methods & Frameworks']),
+    'Mechanical Engineer': ('Engineering', 4800, []),
+    'Maintenance Technician': ('Engineering', 2800, []),
+    'Accountant': ('Accounting / Auditing / Taxation', 4200, ['Enterprise Platforms']),
+    'Sales Executive': ('Sales / Retail', 3500, ['Soft Skills', 'Enterprise Platforms']),
+    'Marketing Executive': ('Marketing / Public Relations', 3800, ['Soft Skills']),
+    'Customer Service Officer': ('Customer Service', 2800, ['Soft Skills']),
+    'Administrative Assistant': ('Admin / Secretarial', 2600, []),
+    'HR Executive': ('Human Resources', 4000, ['Soft Skills']),
+    'Logistics Coordinator': ('Logistics / Supply Chain', 3200, []),
+    'Staff Nurse': ('Healthcare / Pharmaceutical', 3800, []),
+    'Teacher': ('Education and Training', 4200, []),
+}
+
+# Seniority prefix: (experience range in years, salary multiplier, position level)
+SENIORITY = {
+    '': ((1, 6), 1.0, 'Executive'),
+    'Junior ': ((0, 2), 0.75, 'Junior Executive'),
+    'Assistant ': ((0, 3), 0.7, 'Fresh/entry level'),
+    'Senior ': ((4, 10), 1.35, 'Senior Executive'),
+    'Lead ': ((6, 12), 1.6, 'Manager'),
+    'Principal ': ((10, 20), 2.0, 'Senior Management'),
+}
+
+POSITION_LEVELS = [
+    'Fresh/entry level', 'Junior Executive', 'Executive', 'Senior Executive',
+    'Professional', 'Manager', 'Middle Management', 'Senior Management', 'Non-executive'
+]
+
+# (value, weight)
+EMPLOYMENT_TYPES = [
+    ('Permanent', 0.45), ('Full Time', 0.3), ('Contract', 0.12), ('Part Time', 0.05),
+    ('Temporary', 0.04), ('Freelance', 0.02), ('Internship/Attachment', 0.02)
+]
+JOB_STATUSES = [('Closed', 0.65), ('Open', 0.3), ('Re-open', 0.05)]
+
+COMPANY_WORDS = [
+    'Asia', 'Pacific', 'Lion', 'Merlion', 'Straits', 'Harbour', 'Orchid', 'Global', 'Summit',
+    'Keppel', 'Marina', 'Raffles', 'Tanjong', 'Jurong', 'Sentosa', 'Unity', 'Apex', 'Vertex',
+    'Horizon', 'Pioneer', 'Evergreen', 'Golden', 'Crescent', 'Nova'
+]
+COMPANY_KINDS = ['Technologies', 'Solutions', 'Holdings', 'Engineering', 'Logistics', 'Consulting',
+                 'Healthcare', 'Trading', 'Services', 'Systems']
+
+
+def _zipf_weights(n, skew):
+    """Weights for ranks 1..n proportional to rank^-skew"""
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -skew
+    return weights / weights.sum()
+
+
+def _choice(rng, options, size):
+    values, weights = zip(*options)
+    weights = np.asarray(weights) / sum(weights)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights)]
+
+
+class JobDataGenerator:
+    """Seeded generator of SGJobData-compatible postings
+
+    Titles are drawn from a Zipf-skewed vocabulary of seniority x role x skill
+    keyword combinations, so a few titles dominate as in the real data. The same
+    seed, vocabulary size and batch size always produce the same rows.
+
+    `malformed_rate` is the share of lines with the wrong number of fields (for
+    the ingestion quarantine); `dirty_rate` is the share of rows with a missing
+    or non-numeric value in a cleaned column.
+    """
+
+    def __init__(self, seed=0, n_titles=5000, title_skew=1.1, n_companies=3000,
+                 company_skew=0.9, malformed_rate=0.0, dirty_rate=0.0):
+        self.seed = seed
+        self.malformed_rate = malformed_rate
+        self.dirty_rate = dirty_rate
+
+        rng = np.random.default_rng([seed, 0])
+        self.titles = self._title_vocabulary(rng, n_titles)
+        self.title_weights = _zipf_weights(len(self.titles), title_skew)
+        self.companies = self._company_names(rng, n_companies)
+        self.company_weights = _zipf_weights(len(self.companies), company_skew)
+
+    @staticmethod
+    def _title_vocabulary(rng, n_titles):
+        """Frame of distinct titles with their category, pay and experience attributes"""
+        categories = sorted({category for category, _, _ in ROLES.values()})
+        rows, seen = [], set()
+        roles, prefixes = list(ROLES), list(SENIORITY)
+
+        for _ in range(n_titles * 20):
+            if len(rows) >= n_titles:
+                break
+            role, prefix = roles[rng.integers(len(roles))], prefixes[rng.integers(len(prefixes))]
+            category, base_salary, groups = ROLES[role]
+
+            # Most titles carry one or two skill keywords from the role's groups
+            title = prefix + role
+            pool = [skill for group in groups for skill in SkillsAnalyzer.SKILLS_DICT[group]]
+            n_skills = rng.choice([0, 1, 2], p=[0.4, 0.4, 0.2]) if pool else 0
+            if n_skills:
+                skills = rng.choice(pool, size=min(n_skills, len(pool)), replace=False)
+                title += ' (' + ', '.join(skills) + ')' if rng.random() < 0.7 else ' - ' + skills[0]
+            if title in seen:
+                continue
+            seen.add(title)
+
+            (exp_low, exp_high), multiplier, level = SENIORITY[prefix]
+            second = categories[rng.integers(len(categories))] if rng.random() < 0.3 else None
+            rows.append({
+                'title': title,
+                'category': category,
+                'second_category': second if second != category else None,
+                'salary': base_salary * multiplier,
+                'exp_low': exp_low,
+                'exp_high': exp_high,
+                'level': level
+            })
+
+        titles = pd.DataFrame(rows)
+        titles['categories_one'] = [
+            JobDataGenerator._categories_json(primary, None) for primary in titles['category']
+        ]
+        titles['categories_two'] = [
+            JobDataGenerator._categories_json(primary, second)
+            for primary, second in zip(titles['category'], titles['second_category'])
+        ]
+        return titles
+
+    @staticmethod
+    def _company_names(rng, n_companies):
+        """Shuffled word-combination names, numbered once the combinations run out"""
+        combos = [
+            f'{first} {second} {kind}' for first in COMPANY_WORDS for second in COMPANY_WORDS
+            for kind in COMPANY_KINDS if first != second
+        ]
+        combos = [combos[i] for i in rng.permutation(len(combos))]
+        names = [
+            f'{combos[i % len(combos)]}{"" if i < len(combos) else f" {i // len(combos) + 1}"} Pte. Ltd.'
+            for i in range(n_companies)
+        ]
+        return np.array(names, dtype=object)
+
+    @staticmethod
+    def _categories_json(primary, second):
+        cats = [{'id': 0, 'category': primary}]
+        if pd.notna(second):
+            cats.append({'id': 1, 'category': second})
+        return json.dumps(cats)
+
+    def batch(self, size, batch_no=0):
+        """One batch of `size` well-formed (possibly dirty) postings as a DataFrame"""
+        rng = np.random.default_rng([self.seed, 1, batch_no])
+        titles = self.titles
+        ids = rng.choice(len(titles), size=size, p=self.title_weights)
+
+        exp_low = titles['exp_low'].to_numpy()[ids]
+        exp_high = titles['exp_high'].to_numpy()[ids]
+        experience = exp_low + np.floor(rng.random(size) * (exp_high - exp_low + 1)).astype(np.int64)
+
+        base = titles['salary'].to_numpy()[ids] * (1 + 0.04 * experience)
+        salary_min = np.round(base * rng.lognormal(0, 0.2, size) / 100) * 100
+        salary_max = np.round(salary_min * rng.uniform(1.1, 1.6, size) / 100) * 100
+
+        levels = titles['level'].to_numpy(dtype=object)[ids]
+        relabel = rng.random(size) < 0.1
+        levels[relabel] = np.asarray(POSITION_LEVELS, dtype=object)[rng.integers(len(POSITION_LEVELS), size=relabel.sum())]
+
+        # The secondary category is listed on about half of a title's postings
+        with_second = rng.random(size) < 0.5
+        categories = np.where(
+            with_second,
+            titles['categories_two'].to_numpy(dtype=object)[ids],
+            titles['categories_one'].to_numpy(dtype=object)[ids]
+        )
+
+        views = np.floor(rng.lognormal(4.5, 1.0, size)).astype(np.int64)
+        applications = rng.binomial(views, 0.04)
+
+        frame = pd.DataFrame({
+            'title': titles['title'].to_numpy(dtype=object)[ids],
+            'categories': categories,
+            'minimumYearsExperience': experience,
+            'salary_minimum': salary_min.astype(np.int64),
+            'salary_maximum': salary_max.astype(np.int64),
+            'positionLevels': levels,
+            'employmentTypes': _choice(rng, EMPLOYMENT_TYPES, size),
+            'postedCompany_name': self.companies[rng.choice(len(self.companies), size=size, p=self.company_weights)],
+            'status_jobStatus': _choice(rng, JOB_STATUSES, size),
+            'metadata_totalNumberJobApplication': applications,
+            'metadata_totalNumberOfView': views,
+        }, columns=COLUMNS)
+
+        if self.dirty_rate:
+            self._dirty(rng, frame)
+        return frame
+
+    def _dirty(self, rng, frame):
+        """Blank or garble cells in the columns DataProcessor cleans"""
+        size = len(frame)
+        for col, garbage in [('minimumYearsExperience', 'Not specified'), ('salary_minimum', 'Negotiable'),
+                             ('salary_maximum', None), ('positionLevels', None), ('title', None),
+                             ('categories', None)]:
+            hit = np.flatnonzero(rng.random(size) < self.dirty_rate / 6)
+            if len(hit) == 0:
+                continue
+            values = frame[col].astype(str).astype(object)
+            values.iloc[hit] = [garbage if garbage and rng.random() < 0.5 else None for _ in hit]
+            frame[col] = values
+
+    @staticmethod
+    def _csv_lines(frame):
+        """CSV lines of a batch, written by pyarrow (much faster than DataFrame.to_csv)"""
+        buffer = pa.BufferOutputStream()
+        pa_csv.write_csv(
+            pa.Table.from_pandas(frame, preserve_index=False), buffer,
+            pa_csv.WriteOptions(include_header=False)
+        )
+        return buffer.getvalue().to_pybytes().decode('utf-8').split('\n')[:-1]
+
+    def _malformed(self, rng, lines):
+        """Replace a share of CSV lines with wrong-field-count lines"""
+        hit = np.flatnonzero(rng.random(len(lines)) < self.malformed_rate)
+        for i in hit:
+            if rng.random() < 0.5:
+                lines[i] = lines[i] + ',unexpected,extra fields'
+            else:
+                lines[i] = 'Truncated Posting,' + lines[i].rsplit(',', 1)[-1]
+        return lines
+
+    def write_csv(self, path, rows, batch_size=200_000, progress=None):
+        """Stream `rows` postings to a CSV file, one batch in memory at a time"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(','.join(COLUMNS) + '\n')
+            written = 0
+            for batch_no, start in enumerate(range(0, rows, batch_size)):
+                size = min(batch_size, rows - start)
+                lines = self._csv_lines(self.batch(size, batch_no))
+                if self.malformed_rate:
+                    lines = self._malformed(np.random.default_rng([self.seed, 2, batch_no]), lines)
+                f.write('\n'.join(lines) + '\n')
+                written += size
+                if progress:
+                    progress(written)
+        return written
+
+    def frame(self, rows, batch_size=200_000):
+        """`rows` postings as one in-memory DataFrame (the same rows write_csv writes, before malformed lines)"""
+        batches = [
+            self.batch(min(batch_size, rows - start), batch_no)
+            for batch_no, start in enumerate(range(0, rows, batch_size))
+        ]
+        return pd.concat(batches, ignore_index=True) if batches else self.batch(0)
+
+
+def main():
+    """Generate a synthetic dataset from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic SGJobData-compatible postings")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Number of postings")
+    parser.add_argument('--out', default='data/synthetic_SGJobData.csv', help="Output CSV path")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--titles', type=int, default=5000, help="Distinct titles in the vocabulary")
+    parser.add_argument('--title-skew', type=float, default=1.1, help="Zipf exponent of title popularity")
+    parser.add_argument('--companies', type=int, default=3000, help="Distinct companies")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="Share of lines with a wrong field count")
+    parser.add_argument('--dirty-rate', type=float, default=0.0, help="Share of rows with a missing or garbled value")
+    parser.add_argument('--batch-size', type=int, default=200_000, help="Rows generated per batch")
+    args = parser.parse_args()
+
+    generator = JobDataGenerator(
+        seed=args.seed, n_titles=args.titles, title_skew=args.title_skew, n_companies=args.companies,
+        malformed_rate=args.malformed_rate, dirty_rate=args.dirty_rate
+    )
+
+    print(f"Generating {args.rows:,} postings to {args.out} (seed {args.seed}) ...")
+    start = time.perf_counter()
+
+    def progress(written):
+        print(f"   {written:,} rows ({written / (time.perf_counter() - start):,.0f} rows/s)", end='\r')
+
+    generator.write_csv(args.out, args.rows, args.batch_size, progress)
+    print(f"\n✅ Wrote {args.rows:,} postings in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+CSV Ingestion
+Reads SGJobData.csv with pyarrow's multithreaded CSV reader using an explicit
+column schema, and quarantines malformed lines instead of silently dropping them
+"""
+
+import csv
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+import config
+from utilities import DataProcessor, MarketCube, RoleCube, SalarySketch
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+# Free-text and JSON columns, always read as strings (never type-inferred)
+TEXT_COLUMNS = [
+    'title', 'categories', 'positionLevels', 'employmentTypes',
+    'postedCompany_name', 'status_jobStatus'
+]
+
+# Numeric columns; DataProcessor.process_data coerces anything unparseable
+NUMERIC_COLUMNS = [
+    'minimumYearsExperience', 'salary_minimum', 'salary_maximum',
+    'metadata_totalNumberJobApplication', 'metadata_totalNumberOfView'
+]
+
+# Columns DataProcessor.process_data and the aggregates need
+STREAM_COLUMNS = [
+    'title', 'categories', 'minimumYearsExperience', 'salary_minimum', 'salary_maximum',
+    'positionLevels', 'employmentTypes', 'postedCompany_name', 'status_jobStatus'
+]
+
+CSV_SCHEMA = {
+    **{col: pa.string() for col in TEXT_COLUMNS},
+    **{col: pa.float64() for col in NUMERIC_COLUMNS},
+}
+
+
+class BadLineQuarantine:
+    """Collects lines the CSV parser rejects (pyarrow invalid_row_handler)
+
+    The handler may be called from several reader threads at once. pyarrow gives
+    no line number when values may contain newlines (row.number is None), so the
+    lines are identified by their text and written in a stable sorted order.
+    """
+
+    HEADER = ['expected_columns', 'actual_columns', 'text']
+
+    def __init__(self):
+        self.rows = []
+        self._lock = threading.Lock()
+
+    def __call__(self, row):
+        with self._lock:
+            self.rows.append((row.expected_columns, row.actual_columns, row.text))
+        return 'skip'
+
+    def __len__(self):
+        return len(self.rows)
+
+    def write(self, path):
+        """Write the rejected lines to a CSV file (header only when there are none)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        rows = sorted(self.rows)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            writer.writerows(rows)
+
+
+def _open(path):
+    """Open a local path directly, or a remote URL (hf://, s3://, ...) through fsspec"""
+    if '://' in str(path):
+        import fsspec
+        return fsspec.open(path, 'rb').open()
+    return pa.OSFile(str(path), 'rb')
+
+
+def _read_table(path, column_types, quarantine, block_size):
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=block_size)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=quarantine)
+    convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    with _open(path) as f:
+        return pa_csv.read_csv(
+            f, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        )
+
+
+def _column_names(path, block_size):
+    """Column names of the CSV, from its first block"""
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: 'skip')
+    with _open(path) as f:
+        return pa_csv.open_csv(f, read_options=read_options, parse_options=parse_options).schema.names
+
+
+def _cast_numeric(table):
+    """Cast each numeric column to float64 where every value parses"""
+    as_text = []
+    for col in NUMERIC_COLUMNS:
+        if col not in table.column_names:
+            continue
+        i = table.column_names.index(col)
+        try:
+            table = table.set_column(i, col, table.column(i).cast(pa.float64()))
+        except pa.ArrowInvalid:
+            as_text.append(col)
+    return table, as_text
+
+
+def read_job_csv(path=config.DATA_FILE, quarantine_path=None, block_size=config.CSV_BLOCK_SIZE):
+    """Parse the job postings CSV into a DataFrame on all cores
+
+    Lines with the wrong number of fields are skipped and, when quarantine_path
+    is given, written there. Returns (df, report) where report holds the row and
+    rejection counts.
+    """
+    quarantine = BadLineQuarantine()
+    numeric_as_text = []
+    try:
+        table = _read_table(path, CSV_SCHEMA, quarantine, block_size)
+    except pa.ArrowInvalid:
+        # A numeric (or type-inferred) column holds text, e.g. "3 years": re-read
+        # every column as strings and keep as text only the numeric columns that
+        # do not cast, leaving their coercion to DataProcessor.process_data
+        quarantine = BadLineQuarantine()
+        column_types = {col: pa.string() for col in _column_names(path, block_size)}
+        table = _read_table(path, column_types, quarantine, block_size)
+        table, numeric_as_text = _cast_numeric(table)
+
+    if quarantine_path:
+        quarantine.write(quarantine_path)
+
+    report = {
+        'source': str(path),
+        'rows_read': table.num_rows,
+        'rows_rejected': len(quarantine),
+        'quarantine_file': quarantine_path,
+        'numeric_as_text': numeric_as_text,
+    }
+    return table.to_pandas(), report
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def iter_job_csv(path=config.DATA_FILE, quarantine=None, block_size=config.STREAM_BLOCK_SIZE,
+                 columns=STREAM_COLUMNS):
+    """Yield the CSV as raw DataFrames of about block_size bytes each
+
+    Only one block is decoded at a time. Every column is read as a string,
+    since a later block may hold text in a numeric column.
+    """
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=block_size)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=quarantine)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in CSV_SCHEMA},
+        include_columns=columns,
+        strings_can_be_null=True
+    )
+    with _open(path) as f:
+        reader = pa_csv.open_csv(
+            f, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+
+
+def _merge_reports(total, report):
+    for key, value in report.items():
+        if isinstance(value, dict):
+            _merge_reports(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def _merge_tree(levels, part, merge):
+    """Add a chunk aggregate to levels, where levels[i] merges 2**i chunks (or is None)
+
+    Equal-sized partial aggregates are merged like carries in a binary counter,
+    keeping at most log2(chunks) partial aggregates in memory.
+    """
+    level = 0
+    while level < len(levels) and levels[level] is not None:
+        part = merge([levels[level], part])
+        levels[level] = None
+        level += 1
+    if level == len(levels):
+        levels.append(part)
+    else:
+        levels[level] = part
+
+
+def _merge_levels(levels, merge):
+    """Merge the partial aggregates left by _merge_tree, oldest chunks first (None without any)"""
+    parts = [part for part in reversed(levels) if part is not None]
+    if len(parts) <= 1:
+        return parts[0] if parts else None
+    return merge(parts)
+
+
+def aggregate_job_csv(path=config.DATA_FILE, quarantine_path=None, block_size=config.STREAM_BLOCK_SIZE):
+    """Build the MarketCube, RoleCube and SalarySketch in one pass over the CSV, chunk by chunk
+
+    Peak memory is one block of postings plus the partial aggregates, so this
+    works on extracts larger than RAM. Chunk aggregates are merged as a binary
+    tree (_merge_tree), so each is merged O(log chunks) times rather than once
+    per later chunk. Returns (cube, role_cube, salaries, report) where report
+    merges the per-chunk cleaning reports and the ingestion counts.
+    """
+    quarantine = BadLineQuarantine()
+    cubes, role_cubes, sketches = [], [], []
+    report = {'chunks': 0}
+
+    for raw in iter_job_csv(path, quarantine, block_size):
+        df, chunk_report = DataProcessor.process_data(raw, return_report=True)
+        _merge_reports(report, chunk_report)
+        report['chunks'] += 1
+        if len(df) == 0:
+            continue
+
+        _merge_tree(cubes, MarketCube.build(df), MarketCube.merge)
+        _merge_tree(role_cubes, RoleCube.build(df), RoleCube.merge)
+        _merge_tree(sketches, SalarySketch.build(df, config.EXPERIENCE_LEVELS), SalarySketch.merge)
+
+    cube = _merge_levels(cubes, MarketCube.merge)
+    role_cube = _merge_levels(role_cubes, RoleCube.merge)
+    salaries = _merge_levels(sketches, SalarySketch.merge)
+
+    if quarantine_path:
+        quarantine.write(quarantine_path)
+
+    report['ingest'] = {
+        'source': str(path),
+        'rows_read': report.get('rows_in', 0),
+        'rows_rejected': len(quarantine),
+        'quarantine_file': quarantine_path,
+    }
+    return cube, role_cube, salaries, report
@@ -0,0 +1,234 @@
+"""
+Instrumentation
+Timing spans, counters and latency histograms for the dashboard hot paths,
+exported in the Prometheus text format to a file or an HTTP endpoint
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = 'careerpath_'
+
+# Latency histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    'span_seconds': "Wall time of instrumented spans (data load, page renders, analyzer calls)",
+    'span_errors_total': "Spans that ended with an exception",
+    'cache_lookups_total': "Cache lookups by result (hit or miss)",
+    'slow_runs_total': "Script runs slower than the profiler threshold",
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs
+    )
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram for one label set"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative, lower = 0, 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if n and cumulative + n >= rank:
+                return lower + (upper - lower) * (rank - cumulative) / n
+            cumulative += n
+            lower = upper
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by name and labels"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block as span `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('span_errors_total', span=name, **labels)
+            raise
+        finally:
+            self.observe('span_seconds', time.perf_counter() - start, span=name, **labels)
+
+    def timed(self, name):
+        """Decorator timing every call of a function as span `name`"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    # ------------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------------
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = {
+                key: (list(h.counts), h.sum, h.count, h.buckets) for key, h in self.histograms.items()
+            }
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f'# HELP {PREFIX}{name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {PREFIX}{name} counter')
+            for (metric, key), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{PREFIX}{name}{_format_labels(key)} {value}')
+
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f'# HELP {PREFIX}{name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {PREFIX}{name} histogram')
+            for (metric, key), (counts, total, count, buckets) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, n in zip(buckets + (float('inf'),), counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{PREFIX}{name}_bucket{_format_labels(key, [("le", le)])} {cumulative}')
+                lines.append(f'{PREFIX}{name}_sum{_format_labels(key)} {total:.6f}')
+                lines.append(f'{PREFIX}{name}_count{_format_labels(key)} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Atomically write the metrics file (for the node_exporter textfile collector)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def export(self, path, interval=15):
+        """Write the metrics file at most once every `interval` seconds"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < interval:
+                return False
+            self._last_export = now
+        self.write_prometheus(path)
+        return True
+
+    def span_summary(self):
+        """One row per span and label set: calls, mean, p50, p95 and total seconds"""
+        with self._lock:
+            items = [(key, h) for key, h in self.histograms.items() if key[0] == 'span_seconds']
+            rows = []
+            for (_, labels), h in sorted(items):
+                labels = dict(labels)
+                rows.append({
+                    'span': labels.pop('span'),
+                    'labels': ', '.join(f'{k}={v}' for k, v in labels.items()),
+                    'calls': h.count,
+                    'mean_ms': 1000 * h.sum / h.count if h.count else None,
+                    'p50_ms': 1000 * h.quantile(0.5),
+                    'p95_ms': 1000 * h.quantile(0.95),
+                    'total_s': h.sum,
+                })
+        return rows
+
+    def counter_values(self, name):
+        """{labels: value} for one counter"""
+        with self._lock:
+            return {key: value for (metric, key), value in self.counters.items() if metric == name}
+
+
+# Process-wide registry shared by every module and Streamlit session
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+span = REGISTRY.span
+timed = REGISTRY.timed
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, host='127.0.0.1', registry=REGISTRY):
+    """Serve /metrics on host:port from a daemon thread (idempotent across reruns)"""
+    global _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
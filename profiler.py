@@ -0,0 +1,247 @@
+"""
+Slow Rerun Profiler
+Runs a sample of Streamlit script runs under cProfile and saves the profile,
+together with the page's input values, whenever a run exceeds a latency threshold.
+Also reports the per-module import cost of the dashboard process against a budget
+
+Usage:
+    python profiler.py
+    python profiler.py --module engine --budget 1.0
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import config
+import metrics
+
+# cProfile can only be active in one thread at a time on newer Pythons, so at
+# most one script run is profiled at once; concurrent runs are only timed
+_profile_lock = threading.Lock()
+_active = threading.local()
+
+
+def record_inputs(**values):
+    """Attach widget values to the script run being captured on this thread"""
+    capture = getattr(_active, 'capture', None)
+    if capture is not None:
+        capture['inputs'].update(values)
+
+
+class SlowRunProfiler:
+    """Captures slow script runs into `directory`, keeping the newest `keep`
+
+    Each capture is a JSON file with the run's timing, page and inputs, plus a
+    cProfile dump (`.prof`, readable with pstats or snakeviz) when the run was
+    sampled for profiling.
+    """
+
+    def __init__(self, directory, threshold=3.0, sample_rate=1.0, keep=50):
+        self.directory = directory
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.keep = keep
+
+    @contextmanager
+    def capture(self, **context):
+        """Time (and maybe profile) the enclosed script run"""
+        capture = {'inputs': {}, **context}
+        profile = None
+        if random.random() < self.sample_rate and _profile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) is already active
+                profile = None
+                _profile_lock.release()
+
+        _active.capture = capture
+        start = time.perf_counter()
+        try:
+            yield capture
+        except Exception as e:
+            capture['error'] = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            _active.capture = None
+            if profile is not None:
+                profile.disable()
+                _profile_lock.release()
+            if seconds >= self.threshold:
+                metrics.inc('slow_runs_total', profiled=profile is not None)
+                try:
+                    self._save(capture, seconds, profile)
+                except OSError:
+                    pass
+
+    def _save(self, capture, seconds, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        capture_id = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f'{now % 1:.3f}'[1:] + '-' + uuid.uuid4().hex[:6]
+        prof_file = None
+        if profile is not None:
+            prof_file = f'{capture_id}.prof'
+            profile.dump_stats(os.path.join(self.directory, prof_file))
+
+        record = {
+            'id': capture_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now)),
+            'seconds': round(seconds, 3),
+            'threshold': self.threshold,
+            'profile_file': prof_file,
+            **capture,
+        }
+        with open(os.path.join(self.directory, f'{capture_id}.json'), 'w') as f:
+            json.dump(record, f, indent=2, default=str)
+        self._rotate()
+
+    def _rotate(self):
+        """Delete all but the newest `keep` captures"""
+        for record in self.captures()[self.keep:]:
+            for name in (f"{record['id']}.json", record.get('profile_file')):
+                if name:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    # ------------------------------------------------------------------------
+    # Reading captures
+    # ------------------------------------------------------------------------
+    def captures(self):
+        """Capture records, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        records = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(records, key=lambda r: r['id'], reverse=True)
+
+    def profile_path(self, record):
+        """Path of a capture's cProfile dump (None when the run was not profiled)"""
+        if not record.get('profile_file'):
+            return None
+        path = os.path.join(self.directory, record['profile_file'])
+        return path if os.path.exists(path) else None
+
+
+def top_functions(profile_path, limit=30, sort='cumulative'):
+    """The `limit` most expensive functions of a cProfile dump as row dicts"""
+    stats = pstats.Stats(profile_path)
+    key = {'cumulative': 3, 'tottime': 2, 'calls': 1}[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:limit]
+    return [
+        {
+            'function': f'{func} ({os.path.basename(file)}:{line})' if line else func,
+            'calls': calls,
+            'tottime_s': round(tottime, 4),
+            'cumtime_s': round(cumtime, 4),
+        }
+        for (file, line, func), (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+# ============================================================================
+# IMPORT TIME
+# ============================================================================
+
+def import_times(module='dashboard', python=sys.executable):
+    """Per-module import cost of `module` in a fresh interpreter (python -X importtime)
+
+    Returns one row per imported module, in import order, with its nesting
+    depth and its own and cumulative import time in milliseconds.
+    """
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def import_report(module='dashboard', budget=None, top=20):
+    """Import-time budget report for `module`
+
+    Returns the total import time, whether it is within `budget` seconds, the
+    cost per top-level package (summed self times) and the `top` modules by
+    cumulative time.
+    """
+    rows = import_times(module)
+    total = sum(row['self_ms'] for row in rows) / 1000
+
+    packages = {}
+    for row in rows:
+        package = row['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + row['self_ms']
+
+    return {
+        'module': module,
+        'total_s': round(total, 3),
+        'budget_s': budget,
+        'within_budget': budget is None or total <= budget,
+        'packages': [
+            {'package': name, 'ms': round(ms, 1)}
+            for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        'modules': sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:top],
+    }
+
+
+def main():
+    """Print the import-time budget report from the command line"""
+    parser = argparse.ArgumentParser(description="Import-time budget report for the dashboard process")
+    parser.add_argument('--module', default='dashboard', help="Module to import in a fresh interpreter")
+    parser.add_argument('--budget', type=float, default=config.IMPORT_BUDGET_SECONDS,
+                        help="Allowed import time in seconds")
+    parser.add_argument('--top', type=int, default=20, help="Packages and modules to list")
+    args = parser.parse_args()
+
+    report = import_report(args.module, args.budget, args.top)
+    print(f"import {report['module']}: {report['total_s']:.2f}s (budget {report['budget_s']:.2f}s)\n")
+    print("By package:")
+    for row in report['packages']:
+        print(f"  {row['package']:<30} {row['ms']:9.1f} ms")
+    print("\nSlowest modules (cumulative):")
+    for row in report['modules']:
+        print(f"  {'  ' * row['depth'] + row['module']:<60} {row['cumulative_ms']:9.1f} ms  (self {row['self_ms']:.1f})")
+
+    if not report['within_budget']:
+        print(f"\n❌ Import time is over the {report['budget_s']:.2f}s budget")
+        return 1
+    print("\n✅ Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -89,14 +89,15 @@ def suggest_next_steps():
     print_header("Setup Complete! 🎉")
     
     print("Next steps:")
-    print("1. Run the dashboard: streamlit run dashboard.py")
-    print("2. Dashboard will open in your browser (usually http://localhost:8501)")
-    print("3. Start with Home & Overview to understand the market")
-    print("4. Select your user type (Mid-Career Professional or Career Switcher)")
-    print("5. Read the Usage Guide for detailed walkthroughs")
+    print("1. Build the data snapshot: python snapshot.py")
+    print("2. Run the dashboard: streamlit run dashboard.py")
+    print("3. Dashboard will open in your browser (usually http://localhost:8501)")
+    print("4. Start with Home & Overview to understand the market")
+    print("5. Select your user type (Mid-Career Professional or Career Switcher)")
+    print("6. Read the Usage Guide for detailed walkthroughs")
     print("\nTroubleshooting:")
     print("- If dashboard doesn't load, check that SGJobData.csv is in the right directory")
-    print("- First load may take 1-2 minutes while data is being cached")
+    print("- Without a snapshot, first load may take 1-2 minutes while data is being cached")
     print("- Clear cache with: rm -rf .streamlit/cache (or delete folder on Windows)")
 
 def check_windows_requirements():
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Dataset Snapshot Builder
+Converts SGJobData.csv once into a typed, compressed Parquet snapshot so the
+dashboard can start without re-parsing (or re-downloading) the raw CSV
+
+Usage:
+    python snapshot.py
+    python snapshot.py --csv data/SGJobData.csv --out data/snapshot
+"""
+
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import config
+import ingest
+from utilities import (
+    DataProcessor, FuzzyTitleIndex, MarketCube, SalarySketch, SkillIndex, SkillsAnalyzer, TitleCanonicalizer,
+    TransitionGraph, preprocessing_pool, preprocessing_workers
+)
+
+# Low-cardinality columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = ['primary_category', 'canonical_role', 'seniority', 'role_family']
+
+# Columns holding Python lists, stored as Arrow list<string>
+LIST_COLUMNS = ['all_categories']
+
+
+def snapshot_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the postings Parquet file inside a snapshot directory"""
+    return os.path.join(snapshot_dir, config.SNAPSHOT_FILE)
+
+
+def skill_index_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted postings x skills matrix"""
+    return os.path.join(snapshot_dir, config.SKILL_INDEX_FILE)
+
+
+def cube_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted market cube"""
+    return os.path.join(snapshot_dir, config.CUBE_FILE)
+
+
+def transition_graph_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted role transition graph"""
+    return os.path.join(snapshot_dir, config.TRANSITION_GRAPH_FILE)
+
+
+def fuzzy_index_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted title TF-IDF index"""
+    return os.path.join(snapshot_dir, config.FUZZY_INDEX_FILE)
+
+
+def salary_sketch_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted salary quantile sketches"""
+    return os.path.join(snapshot_dir, config.SALARY_SKETCH_FILE)
+
+
+def salary_titles_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the persisted titles of each salary sketch role"""
+    return os.path.join(snapshot_dir, config.SALARY_TITLES_FILE)
+
+
+def quarantine_path(snapshot_dir=config.SNAPSHOT_DIR):
+    """Path of the CSV lines rejected while building the snapshot"""
+    return os.path.join(snapshot_dir, config.QUARANTINE_FILE)
+
+
+def snapshot_exists(snapshot_dir=config.SNAPSHOT_DIR):
+    """Check whether a snapshot has been built"""
+    return os.path.exists(snapshot_path(snapshot_dir))
+
+
+def snapshot_version(snapshot_dir=config.SNAPSHOT_DIR):
+    """Identifier of the current snapshot build, or None without a snapshot"""
+    if not snapshot_exists(snapshot_dir):
+        return None
+    return str(os.path.getmtime(snapshot_path(snapshot_dir)))
+
+
+def _to_arrow(df):
+    """Convert the processed frame to an Arrow table with stable column types"""
+    df = df.copy()
+
+    # Object columns read from CSV can mix str and numbers; store them as strings
+    for col in df.select_dtypes(include=['object', 'string']).columns.difference(LIST_COLUMNS):
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def build_snapshot(csv_path=config.DATA_FILE, snapshot_dir=config.SNAPSHOT_DIR, workers=None):
+    """Parse and clean the raw CSV once and write the Parquet snapshot
+    
+    Category parsing and skill extraction run on `workers` processes (None =
+    all cores) for extracts of at least PARALLEL_MIN_ROWS rows.
+    """
+    raw, ingest_report = ingest.read_job_csv(csv_path, quarantine_path=quarantine_path(snapshot_dir))
+    workers = preprocessing_workers(workers, rows=len(raw))
+    with preprocessing_pool(workers) as executor:
+        df, report = DataProcessor.process_data(raw, return_report=True, executor=executor, workers=workers)
+        # Rows of the skill index line up with the rows of the snapshot
+        skill_index = SkillIndex.build(df['title'], executor=executor, workers=workers)
+    report['ingest'] = ingest_report
+    
+    # Canonical role taxonomy: near-duplicate titles clustered with MinHash / LSH
+    taxonomy = TitleCanonicalizer(threshold=config.CANONICAL_TITLE_SIMILARITY).canonicalize(df['title'])
+    df = pd.concat([df, taxonomy], axis=1)
+    report['taxonomy'] = {
+        'titles': int(df['title'].nunique()),
+        'canonical_roles': int(taxonomy['canonical_role'].nunique()),
+        'role_families': int(taxonomy['role_family'].nunique()),
+    }
+    report['memory'] = DataProcessor.memory_report(raw, DataProcessor.compact_frame(df))
+    del raw
+
+    table = _to_arrow(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'careerpath.source': str(csv_path).encode(),
+        b'careerpath.built_at': time.strftime('%Y-%m-%dT%H:%M:%S').encode(),
+        b'careerpath.cleaning_report': json.dumps(report).encode(),
+    })
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = snapshot_path(snapshot_dir)
+    pq.write_table(table, path, compression=config.SNAPSHOT_COMPRESSION)
+
+    skill_index.save(skill_index_path(snapshot_dir))
+    MarketCube.build(df).save(cube_path(snapshot_dir))
+    TransitionGraph.build(
+        df, skill_index,
+        min_postings=config.MIN_JOB_POSTINGS_THRESHOLD,
+        max_neighbors=config.TRANSITION_MAX_NEIGHBORS
+    ).save(transition_graph_path(snapshot_dir))
+    FuzzyTitleIndex.from_postings(df['title']).save(fuzzy_index_path(snapshot_dir))
+    SalarySketch.build(df, config.EXPERIENCE_LEVELS).save(
+        salary_sketch_path(snapshot_dir), salary_titles_path(snapshot_dir)
+    )
+
+    return path, report
+
+
+def load_snapshot(snapshot_dir=config.SNAPSHOT_DIR, columns=None):
+    """Read the Parquet snapshot (optionally only some columns) as a DataFrame
+    
+    Requested columns missing from an older snapshot are skipped.
+    """
+    path = snapshot_path(snapshot_dir)
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in available]
+    table = pq.read_table(path, columns=columns)
+    return table.to_pandas()
+
+
+def load_skill_index(snapshot_dir=config.SNAPSHOT_DIR, skills=None):
+    """Load the persisted skill index, or None if missing or built for other skills"""
+    path = skill_index_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    return SkillIndex.load(path, skills or SkillsAnalyzer.MATCHER.skills)
+
+
+def load_cube(snapshot_dir=config.SNAPSHOT_DIR):
+    """Load the persisted market cube, or None if it has not been built"""
+    path = cube_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    return MarketCube.load(path)
+
+
+def load_transition_graph(snapshot_dir=config.SNAPSHOT_DIR):
+    """Load the persisted transition graph, or None if it has not been built"""
+    path = transition_graph_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    return TransitionGraph.load(path)
+
+
+def load_fuzzy_index(snapshot_dir=config.SNAPSHOT_DIR):
+    """Load the persisted title TF-IDF index, or None if it has not been built"""
+    path = fuzzy_index_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    return FuzzyTitleIndex.load(path)
+
+
+def load_salary_sketch(snapshot_dir=config.SNAPSHOT_DIR):
+    """Load the persisted salary quantile sketches, or None if they have not been built"""
+    path = salary_sketch_path(snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    return SalarySketch.load(path, salary_titles_path(snapshot_dir))
+
+
+def main():
+    """Build the snapshot from the command line"""
+    parser = argparse.ArgumentParser(description="Build the local SGJobData snapshot")
+    parser.add_argument('--csv', default=config.DATA_FILE, help="Source CSV (local path or hf:// URL)")
+    parser.add_argument('--out', default=config.SNAPSHOT_DIR, help="Snapshot output directory")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Preprocessing processes (default: all cores, 1 = serial)")
+    args = parser.parse_args()
+
+    print(f"Building snapshot from {args.csv} ...")
+    start = time.perf_counter()
+    path, report = build_snapshot(args.csv, args.out, args.workers)
+    elapsed = time.perf_counter() - start
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"✅ Snapshot written to {path} ({size_mb:.1f} MB) in {elapsed:.1f}s")
+    print(f"   Rows kept: {report['rows_out']:,} (dropped {report['rows_dropped']:,} empty rows)")
+    taxonomy = report['taxonomy']
+    print(f"   Titles: {taxonomy['titles']:,} distinct -> {taxonomy['canonical_roles']:,} canonical roles "
+          f"in {taxonomy['role_families']:,} role families")
+    rejected = report['ingest']['rows_rejected']
+    if rejected:
+        print(f"   Quarantined {rejected:,} malformed CSV lines to {report['ingest']['quarantine_file']}")
+    for col, count in report['coerced'].items():
+        if count:
+            print(f"   Coerced {count:,} unparseable values in {col} to 0")
+
+    memory = report['memory']
+    print(f"   Memory: raw CSV frame {memory['before_mb']:.1f} MB -> "
+          f"compact frame {memory['after_mb']:.1f} MB ({memory['reduction']}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
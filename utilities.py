@@ -5,25 +5,117 @@ Supports the Career Dashboard with data processing and analysis functions
 # from datasets import load_dataset
 import pandas as pd
 import numpy as np
-from collections import Counter
+from scipy import sparse
+from scipy.sparse import csgraph
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 import json
+import os
 import re
+import threading
+import time
+import zlib
+
+# Below this many distinct values the work stays in-process
+PARALLEL_MIN_ITEMS = 5000
+
+# Below this many rows no pool is started (its startup costs more than it saves)
+PARALLEL_MIN_ROWS = 1_000_000
+
+
+def preprocessing_workers(workers=None, rows=None):
+    """Processes to use for the preprocessing steps (None = all cores, 1 = serial)
+    
+    Inputs of fewer than PARALLEL_MIN_ROWS rows run serially.
+    """
+    if rows is not None and rows < PARALLEL_MIN_ROWS:
+        return 1
+    return workers or os.cpu_count() or 1
+
+
+def preprocessing_pool(workers):
+    """Process pool of `workers` processes for the GIL-bound preprocessing steps (None when 1)"""
+    if workers <= 1:
+        return nullcontext(None)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _apply_partition(func, items):
+    return [func(item) for item in items]
+
+
+def map_partitions(func, items, executor=None, workers=1):
+    """[func(item) for item in items], optionally spread over a process pool
+    
+    Items are split into a few contiguous partitions per worker of the pool
+    (`workers` is the size it was created with) and the results are concatenated
+    in partition order, so the output is identical to the serial loop.
+    """
+    items = list(items)
+    if executor is None or len(items) < PARALLEL_MIN_ITEMS:
+        return _apply_partition(func, items)
+    
+    n_partitions = 4 * workers
+    bounds = np.linspace(0, len(items), n_partitions + 1).astype(int)
+    futures = [
+        executor.submit(_apply_partition, func, items[start:end])
+        for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+    ]
+    
+    results = []
+    for future in futures:
+        results.extend(future.result())
+    return results
+
 
 class DataProcessor:
     """Pre-processes and cleans job data"""
     
     @staticmethod
-    def extract_category(cat_string):
-        """Extract primary category from JSON string"""
+    def extract_categories(cat_string):
+        """Extract every category name from JSON string"""
         if pd.isna(cat_string):
-            return 'Unknown'
+            return []
         try:
             cats = json.loads(cat_string.replace("'", '"'))
-            if cats and len(cats) > 0:
-                return cats[0].get('category', 'Unknown')
+            return [cat.get('category', 'Unknown') for cat in cats]
         except:
-            pass
-        return 'Unknown'
+            return []
+    
+    @classmethod
+    def extract_category(cls, cat_string):
+        """Extract primary category from JSON string"""
+        cats = cls.extract_categories(cat_string)
+        return cats[0] if cats else 'Unknown'
+    
+    @classmethod
+    def parse_categories(cls, categories, executor=None, workers=1):
+        """Parse a whole categories column, decoding each distinct string once
+        
+        Returns a DataFrame aligned with `categories` holding `primary_category`
+        (categorical) and `all_categories` (list of every category in the posting).
+        With a process pool the distinct strings are decoded in parallel.
+        """
+        # codes == -1 for missing values, which picks the sentinel appended below
+        codes, uniques = pd.factorize(categories)
+        
+        parsed = map_partitions(DataProcessor.extract_categories, uniques, executor, workers)
+        parsed.append([])
+        
+        primary_codes, primary_names = pd.factorize(
+            pd.Series([cats[0] if cats else 'Unknown' for cats in parsed], dtype=object)
+        )
+        primary = pd.Categorical.from_codes(primary_codes[codes], categories=primary_names)
+        
+        all_cats = np.empty(len(parsed), dtype=object)
+        for i, cats in enumerate(parsed):
+            all_cats[i] = cats
+        
+        return pd.DataFrame(
+            {'primary_category': primary, 'all_categories': all_cats[codes]},
+            index=categories.index
+        )
     
     @staticmethod
     def clean_salary(value):
@@ -45,28 +137,161 @@ class DataProcessor:
         except:
             return 0
     
+    # Repeated string columns stored as categoricals
+    CATEGORICAL_COLUMNS = ['positionLevels', 'employmentTypes', 'status_jobStatus', 'postedCompany_name']
+    
+    # Columns the dashboard pages and analyzers actually read
+    COMPACT_COLUMNS = [
+        'title', 'primary_category', 'minimumYearsExperience', 'salary_minimum',
+        'salary_maximum', 'average_salary', 'positionLevels', 'employmentTypes',
+        'postedCompany_name', 'status_jobStatus', 'canonical_role', 'seniority', 'role_family'
+    ]
+    
+    @staticmethod
+    def _to_number(values):
+        """Vectorized numeric conversion, counting missing and unparseable values"""
+        numbers = pd.to_numeric(values, errors='coerce')
+        missing = int(values.isna().sum())
+        coerced = int(numbers.isna().sum()) - missing
+        return numbers.fillna(0), missing, coerced
+    
     @classmethod
-    def process_data(cls, df):
-        """Comprehensive data preprocessing"""
-        # Copy to avoid warnings
-        df = df.copy()
+    def process_data(cls, df, return_report=False, executor=None, workers=1):
+        """Comprehensive data preprocessing
+        
+        Shared by the dashboard and the snapshot builder. Numeric columns are
+        downcast (int8 experience, float32 salaries) and repeated strings become
+        categoricals. With `return_report=True` a dict of dropped, filled and
+        coerced row counts is returned alongside the frame. An `executor` from
+        preprocessing_pool(workers) parallelizes category parsing; the output is the same.
+        """
+        report = {'rows_in': len(df), 'missing': {}, 'coerced': {}}
+        
+        # Blank CSV lines come through as all-NaN rows
+        df = df.dropna(how='all').copy()
+        report['rows_dropped'] = report['rows_in'] - len(df)
         
         # Clean numeric columns
-        df['minimumYearsExperience'] = df['minimumYearsExperience'].apply(cls.clean_experience)
-        df['salary_minimum'] = df['salary_minimum'].apply(cls.clean_salary)
-        df['salary_maximum'] = df['salary_maximum'].apply(cls.clean_salary)
+        experience, report['missing']['minimumYearsExperience'], coerced = cls._to_number(df['minimumYearsExperience'])
+        experience = np.trunc(experience)
+        out_of_range = int(((experience < 0) | (experience > 127)).sum())
+        report['coerced']['minimumYearsExperience'] = coerced + out_of_range
+        df['minimumYearsExperience'] = experience.clip(0, 127).astype(np.int8)
+        
+        for col in ['salary_minimum', 'salary_maximum']:
+            salary, report['missing'][col], report['coerced'][col] = cls._to_number(df[col])
+            df[col] = salary.astype(np.float32)
         df['average_salary'] = (df['salary_minimum'] + df['salary_maximum']) / 2
         
         # Extract and clean categories
-        df['primary_category'] = df['categories'].apply(cls.extract_category)
+        categories = cls.parse_categories(df['categories'], executor, workers)
+        df['primary_category'] = categories['primary_category']
+        df['all_categories'] = categories['all_categories']
         
         # Clean position levels
+        report['missing']['positionLevels'] = int(df['positionLevels'].isna().sum())
         df['positionLevels'] = df['positionLevels'].fillna('Not Specified')
         
         # Handle missing titles
+        report['missing']['title'] = int(df['title'].isna().sum())
         df['title'] = df['title'].fillna('Unknown Position')
         
+        for col in cls.CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        report['rows_out'] = len(df)
+        
+        if return_report:
+            return df, report
+        return df
+    
+    @classmethod
+    def compact_frame(cls, df, columns=None):
+        """Slim copy of a processed frame for serving
+        
+        Keeps only the columns in use, stores every string column as a
+        categorical and downcasts the remaining numbers.
+        """
+        columns = [col for col in (columns or cls.COMPACT_COLUMNS) if col in df.columns]
+        df = df[columns].copy()
+        
+        for col in df.columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+                df[col] = values.astype('category')
+            elif pd.api.types.is_integer_dtype(values):
+                df[col] = pd.to_numeric(values, downcast='integer')
+            elif pd.api.types.is_float_dtype(values):
+                df[col] = pd.to_numeric(values, downcast='float')
+        
         return df
+    
+    @staticmethod
+    def memory_report(before, after):
+        """Deep memory usage of two frames in MB and the reduction factor"""
+        before_mb = before.memory_usage(deep=True).sum() / (1024 * 1024)
+        after_mb = after.memory_usage(deep=True).sum() / (1024 * 1024)
+        return {
+            'before_mb': round(before_mb, 2),
+            'after_mb': round(after_mb, 2),
+            'reduction': round(before_mb / after_mb, 2) if after_mb else None
+        }
+
+
+class SkillMatcher:
+    """Matches a fixed skill vocabulary against text with one compiled regex"""
+    
+    def __init__(self, skills):
+        # Drop duplicate keywords, keeping vocabulary order
+        self.skills = list(dict.fromkeys(skills))
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+        self._lookup = {skill.lower(): skill for skill in self.skills}
+        
+        # One case-insensitive alternation, longest keywords first. The match sits in
+        # a lookahead so overlapping hits ('Project Management' and 'Management') are
+        # all reported, and the alphanumeric guards stop 'AI' matching 'MAINTENANCE'.
+        alternatives = '|'.join(
+            re.escape(skill) for skill in sorted(self.skills, key=len, reverse=True)
+        )
+        self.pattern = re.compile(
+            r'(?<![A-Za-z0-9])(?=(' + alternatives + r')(?![A-Za-z0-9]))',
+            re.IGNORECASE
+        )
+    
+    def extract(self, text):
+        """Extract skills from a single text, in vocabulary order"""
+        if pd.isna(text):
+            return []
+        
+        found = {self._lookup[match.lower()] for match in self.pattern.findall(str(text))}
+        return sorted(found, key=self._order.get)
+    
+    def extract_series(self, texts):
+        """Extract skills for a whole Series, matching each distinct text once"""
+        codes, uniques = pd.factorize(texts)
+        
+        # codes == -1 for missing values, which picks the empty list appended last
+        matched = np.empty(len(uniques) + 1, dtype=object)
+        for i, text in enumerate(uniques):
+            matched[i] = self.extract(text)
+        matched[-1] = []
+        
+        return pd.Series(matched[codes], index=texts.index)
+    
+    def count_skills(self, texts):
+        """Count skill occurrences across a Series of texts"""
+        codes, uniques = pd.factorize(texts)
+        occurrences = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        
+        skill_counts = Counter()
+        for text, n in zip(uniques, occurrences):
+            for skill in self.extract(text):
+                skill_counts[skill] += int(n)
+        
+        return skill_counts
 
 
 class SkillsAnalyzer:
@@ -80,17 +305,21 @@ class SkillsAnalyzer:
         ],
         'Web Technologies': [
             'React', 'Vue.js', 'Angular', 'Node.js', 'Django', 'Flask',
-            'Spring Boot', 'ASP.NET', 'Express.js', 'Next.js'
+            'Spring Boot', 'ASP.NET', 'Express.js', 'Next.js',
+            'Frontend', 'Backend', 'Full Stack'
         ],
         'Database & Data': [
             'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
             'Elasticsearch', 'Oracle', 'Cassandra', 'Data Science', 
-            'Data Analysis', 'Analytics', 'Tableau', 'Power BI'
+            'Data Analysis', 'Analytics', 'Tableau', 'Power BI', 'BI'
         ],
         'Cloud & DevOps': [
             'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes',
-            'CI/CD', 'Jenkins', 'GitLab', 'GitHub', 'DevOps',
-            'Infrastructure as Code', 'Terraform', 'Ansible'
+            'CI/CD', 'Jenkins', 'Git', 'GitLab', 'GitHub', 'DevOps',
+            'Infrastructure as Code', 'Terraform', 'Ansible', 'Linux'
+        ],
+        'Enterprise Platforms': [
+            'Salesforce', 'SAP'
         ],
         'Machine Learning & AI': [
             'Machine Learning', 'Deep Learning', 'AI', 'TensorFlow',
@@ -123,45 +352,1127 @@ class SkillsAnalyzer:
     for category_skills in SKILLS_DICT.values():
         FLAT_SKILLS.extend(category_skills)
     
+    # Compiled once, shared by every skill lookup
+    MATCHER = SkillMatcher(FLAT_SKILLS)
+    
     @classmethod
     def extract_skills(cls, text):
         """Extract skills from job title or description"""
-        if pd.isna(text):
+        return cls.MATCHER.extract(text)
+    
+    @classmethod
+    def extract_skills_series(cls, texts):
+        """Extract skills for every title in a Series"""
+        return cls.MATCHER.extract_series(texts)
+    
+    @classmethod
+    def get_skills_by_role(cls, df, role_keyword, limit=50, skill_index=None, title_index=None):
+        """Get most common skills for a specific role
+        
+        With a SkillIndex every matching posting is counted and `limit` is ignored.
+        """
+        rows = find_title_rows(df, role_keyword, title_index)
+        if skill_index is not None:
+            return skill_index.counts(rows)
+        
+        filtered = df.iloc[rows[:limit]]
+        return cls.MATCHER.count_skills(filtered['title'])
+    
+    @classmethod
+    def get_skills_by_category(cls, df, category, skill_index=None):
+        """Get common skills in a specific industry"""
+        mask = df['primary_category'] == category
+        if skill_index is not None:
+            return skill_index.counts(mask.to_numpy()).most_common(10)
+        
+        filtered = df[mask]
+        skill_counts = cls.MATCHER.count_skills(filtered['title'].head(100))
+        return skill_counts.most_common(10)
+
+
+class SkillIndex:
+    """Sparse postings x skills matrix, built once so skill counts become column sums"""
+    
+    def __init__(self, matrix, skills):
+        self.matrix = sparse.csr_matrix(matrix)
+        self.skills = list(skills)
+    
+    def __len__(self):
+        return self.matrix.shape[0]
+    
+    @classmethod
+    def build(cls, titles, matcher=None, executor=None, workers=1):
+        """Build the index from a Series of titles (one row per posting)
+        
+        With a process pool from preprocessing_pool(workers) the distinct titles
+        are matched in parallel.
+        """
+        matcher = matcher or SkillsAnalyzer.MATCHER
+        skill_ids = {skill: i for i, skill in enumerate(matcher.skills)}
+        
+        # Match each distinct title once, then expand to postings by row selection
+        codes, uniques = pd.factorize(titles)
+        rows, cols = [], []
+        for i, skills in enumerate(map_partitions(matcher.extract, uniques, executor, workers)):
+            for skill in skills:
+                rows.append(i)
+                cols.append(skill_ids[skill])
+        
+        # Missing titles (code -1) point at the extra empty row
+        title_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.uint8), (rows, cols)),
+            shape=(len(uniques) + 1, len(matcher.skills))
+        )
+        codes = np.where(codes < 0, len(uniques), codes)
+        
+        return cls(title_matrix[codes], matcher.skills)
+    
+    def counts(self, rows=None):
+        """Skill counts over selected postings (boolean mask or positions)"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        totals = np.asarray(matrix.sum(axis=0, dtype=np.int64)).ravel()
+        
+        return Counter({self.skills[i]: int(totals[i]) for i in np.flatnonzero(totals)})
+    
+    def save(self, path):
+        """Persist the index with its skill vocabulary"""
+        np.savez_compressed(
+            path,
+            data=self.matrix.data, indices=self.matrix.indices,
+            indptr=self.matrix.indptr, shape=np.array(self.matrix.shape),
+            skills=np.array(self.skills)
+        )
+    
+    @classmethod
+    def load(cls, path, skills=None):
+        """Load a persisted index, or None if it was built for another vocabulary"""
+        with np.load(path) as stored:
+            if skills is not None and list(stored['skills']) != list(skills):
+                return None
+            matrix = sparse.csr_matrix(
+                (stored['data'], stored['indices'], stored['indptr']),
+                shape=tuple(stored['shape'])
+            )
+            return cls(matrix, stored['skills'].tolist())
+
+
+def popcount(words):
+    """Number of set bits in each row of a uint64 word matrix"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    # NumPy < 2: per-byte lookup table
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    octets = np.ascontiguousarray(words).view(np.uint8).reshape(len(words), -1)
+    return table[octets].sum(axis=1, dtype=np.int64)
+
+
+class SkillBitset:
+    """Skill sets packed into 64-bit words, one row per posting (or role)
+    
+    A profile is scored against every row with one AND and a popcount instead
+    of a set intersection per posting.
+    """
+    
+    def __init__(self, words, skills):
+        self.words = words
+        self.skills = list(skills)
+        self.sizes = popcount(words)
+        self._ids = {skill.lower(): i for i, skill in enumerate(self.skills)}
+    
+    def __len__(self):
+        return len(self.words)
+    
+    @classmethod
+    def from_skill_index(cls, skill_index):
+        """Pack a SkillIndex (rows x skills incidence) into words"""
+        n_words = max(1, -(-len(skill_index.skills) // 64))
+        words = np.zeros((len(skill_index), n_words), dtype=np.uint64)
+        columns = skill_index.matrix.tocsc()
+        for j in range(len(skill_index.skills)):
+            rows = columns.indices[columns.indptr[j]:columns.indptr[j + 1]]
+            words[rows, j // 64] |= np.uint64(1 << (j % 64))
+        return cls(words, skill_index.skills)
+    
+    def encode(self, skills):
+        """Word vector of a list of skill names (case-insensitive, unknown names ignored)"""
+        vector = np.zeros(self.words.shape[1], dtype=np.uint64)
+        for skill in skills:
+            j = self._ids.get(str(skill).lower())
+            if j is not None:
+                vector[j // 64] |= np.uint64(1 << (j % 64))
+        return vector
+    
+    def decode(self, vector):
+        """Skill names set in a word vector"""
+        return [skill for j, skill in enumerate(self.skills) if int(vector[j // 64]) >> (j % 64) & 1]
+    
+    def match(self, user_skills):
+        """calculate_skill_match of the user against every row (unrounded percentages)"""
+        matched = popcount(self.words & self.encode(user_skills))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.sizes == 0, 100.0, 100.0 * matched / self.sizes)
+
+
+class RoleRecommender:
+    """Ranks every role by how well a skill profile covers its postings' skills
+    
+    Each row of the bitset (a posting, or a whole role in streaming mode) is
+    scored with SkillBitset.match; a role's fit is the mean score over its rows
+    that require any skill, weighted by the postings each row stands for.
+    """
+    
+    def __init__(self, bitset, role_codes, roles, salary, weights=None):
+        self.bitset = bitset
+        self.roles = np.asarray(roles, dtype=object)
+        self.salary = np.asarray(salary, dtype=np.float64)
+        
+        scored = np.flatnonzero((role_codes >= 0) & (bitset.sizes > 0))
+        self._rows = scored
+        self._codes = role_codes[scored]
+        self._weights = np.ones(len(scored)) if weights is None else np.asarray(weights, dtype=np.float64)[scored]
+        self.postings = np.bincount(self._codes, weights=self._weights, minlength=len(self.roles))
+        
+        # Union of the skills over each role's rows
+        order = np.argsort(self._codes, kind='stable')
+        starts = np.flatnonzero(np.diff(self._codes[order], prepend=-1))
+        self.role_words = np.zeros((len(self.roles), bitset.words.shape[1]), dtype=np.uint64)
+        if len(order):
+            self.role_words[self._codes[order][starts]] = np.bitwise_or.reduceat(
+                bitset.words[scored[order]], starts, axis=0
+            )
+    
+    @classmethod
+    def build(cls, df, skill_index):
+        """Recommender over every posting of a processed DataFrame and its aligned SkillIndex"""
+        codes, roles = role_codes(df)
+        
+        valid = np.flatnonzero(codes >= 0)
+        counts = np.bincount(codes[valid], minlength=len(roles))
+        salary = np.bincount(
+            codes[valid], weights=df['average_salary'].to_numpy(dtype=np.float64)[valid], minlength=len(roles)
+        ) / np.maximum(counts, 1)
+        return cls(SkillBitset.from_skill_index(skill_index), codes, roles, salary)
+    
+    @classmethod
+    def from_role_cube(cls, role_cube):
+        """Recommender over the role aggregates (one row per role, weighted by its postings)"""
+        counts = role_cube.roles['count'].to_numpy()
+        return cls(
+            SkillBitset.from_skill_index(role_cube.skill_index), np.arange(len(counts)),
+            role_cube.roles.index, role_cube.roles['salary_sum'].to_numpy() / counts, weights=counts
+        )
+    
+    def best_fit_roles(self, user_skills, top_k=10, min_postings=1):
+        """The top_k roles by mean skill match, with the skills each one would add"""
+        vector = self.bitset.encode(user_skills)
+        scores = self.bitset.match(user_skills)[self._rows]
+        totals = np.bincount(self._codes, weights=scores * self._weights, minlength=len(self.roles))
+        full = np.bincount(self._codes, weights=(scores >= 100.0) * self._weights, minlength=len(self.roles))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fit = totals / self.postings
+        
+        eligible = np.flatnonzero((self.postings >= min_postings) & (fit > 0))
+        ranked = eligible[np.lexsort((-self.postings[eligible], -fit[eligible]))][:top_k]
+        
+        return [
+            {
+                'role': self.roles[i],
+                'match': round(float(fit[i]), 1),
+                'postings': int(self.postings[i]),
+                'full_match_postings': int(full[i]),
+                'avg_salary': float(self.salary[i]),
+                'skills_to_add': self.bitset.decode(self.role_words[i] & ~vector),
+            }
+            for i in ranked
+        ]
+
+
+class TitleIndex:
+    """Trigram inverted index over distinct normalized job titles
+    
+    Lookups return row positions of matching postings, with the same
+    case-insensitive substring semantics as `str.contains` (without regex).
+    """
+    
+    def __init__(self, titles):
+        codes, uniques = pd.factorize(titles)
+        self.titles = [self.normalize(title) for title in uniques]
+        
+        # Posting positions grouped by title id: _postings[_offsets[i]:_offsets[i + 1]]
+        valid = np.flatnonzero(codes >= 0)
+        self._postings = valid[np.argsort(codes[valid], kind='stable')]
+        self._offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(codes[valid], minlength=len(uniques)))]
+        )
+        
+        grams = defaultdict(list)
+        for i, title in enumerate(self.titles):
+            for gram in self._trigrams(title):
+                grams[gram].append(i)
+        self._grams = {gram: np.array(ids, dtype=np.int64) for gram, ids in grams.items()}
+    
+    @staticmethod
+    def normalize(text):
+        """Lowercase and collapse whitespace"""
+        return ' '.join(str(text).lower().split())
+    
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def match_titles(self, query):
+        """Ids of distinct titles containing the query as a phrase"""
+        query = self.normalize(query)
+        grams = self._trigrams(query)
+        
+        if grams:
+            lists = [self._grams.get(gram) for gram in grams]
+            if any(ids is None for ids in lists):
+                return np.empty(0, dtype=np.int64)
+            
+            # Intersect the rarest trigram lists first
+            lists.sort(key=len)
+            candidates = lists[0]
+            for ids in lists[1:]:
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        else:
+            candidates = np.arange(len(self.titles))
+        
+        # Trigrams only narrow the candidates; confirm the phrase itself
+        return np.array([i for i in candidates if query in self.titles[i]], dtype=np.int64)
+    
+    def search(self, query, all_tokens=False):
+        """Row positions of postings whose title contains the query
+        
+        By default the query is matched as a phrase; with `all_tokens=True` every
+        whitespace-separated token must appear, in any order.
+        """
+        if all_tokens and len(query.split()) > 1:
+            title_ids = self.match_titles(query.split()[0])
+            for token in query.split()[1:]:
+                title_ids = np.intersect1d(title_ids, self.match_titles(token), assume_unique=True)
+        else:
+            title_ids = self.match_titles(query)
+        
+        if len(title_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        positions = np.concatenate([
+            self._postings[self._offsets[i]:self._offsets[i + 1]] for i in title_ids
+        ])
+        positions.sort()
+        return positions
+
+
+class FuzzyTitleIndex:
+    """Character n-gram TF-IDF vectors of the distinct normalized titles
+    
+    Answers misspelled or paraphrased role queries with the closest real
+    titles by cosine similarity, one sparse matrix-vector product per query.
+    Titles within TIE_MARGIN of the best similarity count as ties and are
+    ranked by posting volume, so a query lands on the common title rather
+    than a rare variant of it.
+    """
+    
+    NGRAM_RANGE = (2, 4)
+    TIE_MARGIN = 0.02
+    
+    def __init__(self, titles, counts, vectorizer, matrix):
+        self.titles = list(titles)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.vectorizer = vectorizer
+        self.matrix = sparse.csr_matrix(matrix)
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    @classmethod
+    def _vectorizer(cls, vocabulary=None):
+        # sklearn takes about a second to import, so only load it when an index is built or read
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(
+            analyzer='char_wb', ngram_range=cls.NGRAM_RANGE, sublinear_tf=True,
+            dtype=np.float32, vocabulary=vocabulary
+        )
+    
+    @classmethod
+    def build(cls, titles, counts):
+        """Index distinct normalized titles with their posting counts"""
+        vectorizer = cls._vectorizer()
+        matrix = vectorizer.fit_transform(titles)
+        return cls(titles, counts, vectorizer, matrix)
+    
+    @classmethod
+    def from_postings(cls, titles):
+        """Index the distinct normalized titles of a Series of titles (one per posting)"""
+        title_codes, uniques = pd.factorize(titles)
+        role_of_title, roles = pd.factorize(
+            pd.Series([TitleIndex.normalize(title) for title in uniques], dtype=object)
+        )
+        codes = np.append(role_of_title, -1)[title_codes]
+        counts = np.bincount(codes[codes >= 0], minlength=len(roles))
+        return cls.build(list(roles), counts)
+    
+    def nearest(self, query, k=5):
+        """Up to k closest titles with their cosine similarity and posting count, best first"""
+        vector = self.vectorizer.transform([TitleIndex.normalize(query)])
+        if vector.nnz == 0 or len(self.titles) == 0:
             return []
         
-        text_upper = str(text).upper()
-        found_skills = []
+        scores = (self.matrix @ vector.T).toarray().ravel()
+        k = min(k, len(scores))
+        near = scores >= scores.max() - self.TIE_MARGIN
+        candidates = np.union1d(np.argpartition(-scores, k - 1)[:k], np.flatnonzero(near))
+        # Near ties by postings, then everything else by similarity
+        counts = np.where(near[candidates], self.counts[candidates], 0)
+        top = candidates[np.lexsort((-scores[candidates], -counts, ~near[candidates]))][:k]
+        return [
+            {'role': self.titles[i], 'similarity': round(float(scores[i]), 3), 'postings': int(self.counts[i])}
+            for i in top if scores[i] > 0
+        ]
+    
+    def save(self, path):
+        """Persist the titles, the fitted vocabulary and idf weights, and the vectors"""
+        terms = sorted(self.vectorizer.vocabulary_, key=self.vectorizer.vocabulary_.get)
+        np.savez_compressed(
+            path,
+            titles=np.array(self.titles, dtype=str), counts=self.counts,
+            terms=np.array(terms, dtype=str), idf=self.vectorizer.idf_,
+            data=self.matrix.data, indices=self.matrix.indices,
+            indptr=self.matrix.indptr, shape=np.array(self.matrix.shape)
+        )
+    
+    @classmethod
+    def load(cls, path):
+        """Load a persisted index without refitting"""
+        with np.load(path) as stored:
+            terms = stored['terms'].tolist()
+            vectorizer = cls._vectorizer(vocabulary={term: i for i, term in enumerate(terms)})
+            vectorizer.idf_ = stored['idf']
+            matrix = sparse.csr_matrix(
+                (stored['data'], stored['indices'], stored['indptr']), shape=tuple(stored['shape'])
+            )
+            return cls(stored['titles'].tolist(), stored['counts'], vectorizer, matrix)
+
+
+def find_title_rows(df, role_keyword, title_index=None):
+    """Row positions of postings whose title contains role_keyword"""
+    if title_index is not None:
+        return title_index.search(role_keyword)
+    return np.flatnonzero(df['title'].str.contains(role_keyword, case=False, na=False).to_numpy())
+
+
+def role_codes(df):
+    """Role id of every posting (-1 when missing) and the role names
+    
+    Roles are the canonical roles when the frame has them (snapshot.py),
+    otherwise the normalized titles, each distinct title normalized once.
+    """
+    if 'canonical_role' in df.columns:
+        codes, roles = pd.factorize(df['canonical_role'])
+        return codes, np.asarray(roles, dtype=object)
+    
+    title_codes, titles = pd.factorize(df['title'])
+    role_of_title, roles = pd.factorize(
+        pd.Series([TitleIndex.normalize(title) for title in titles], dtype=object)
+    )
+    return np.append(role_of_title, -1)[title_codes], np.asarray(roles, dtype=object)
+
+
+class TitleCanonicalizer:
+    """Clusters near-duplicate job titles into canonical roles with MinHash / LSH
+    
+    Each title is split into a seniority level and a core role, so "Sr. QA
+    Engineer (Contract)" and "QA Engineer - Senior" both become (senior, qa
+    engineer), "Head of Sales" becomes (head, sales) and "Vice President,
+    Engineering" becomes (vp, engineering). Core roles with the same head noun (last word) whose word sets
+    overlap by at least `threshold` (Jaccard) join the role family of their
+    most posted similar core role; MinHash / LSH over the word sets finds the
+    candidate pairs. "Data Engineer" and "QA Engineer" share only half their
+    words and stay apart.
+    """
+    
+    # Title words that set the seniority level (the highest one found wins)
+    SENIORITY = {
+        'intern': 'intern', 'internship': 'intern', 'trainee': 'intern',
+        'junior': 'junior', 'jr': 'junior', 'graduate': 'junior', 'entry': 'junior',
+        'senior': 'senior', 'sr': 'senior', 'snr': 'senior',
+        'lead': 'lead', 'principal': 'principal',
+        'director': 'head', 'chief': 'head', 'vp': 'vp',
+    }
+    # Only seniority prefixes at the start of a title segment ("Assistant Manager", not
+    # "Admin Assistant"; "Head of Sales", not "Head Chef"). "Staff" and "Associate" are
+    # left alone: "Staff Nurse" and "Associate Professor" are roles
+    LEADING_SENIORITY = {('head', 'of'): 'head', ('assistant',): 'assistant'}
+    LEVELS = ['intern', 'junior', 'assistant', 'unspecified', 'senior', 'lead', 'principal', 'head', 'vp']
+    # How a level is written before the role family in a canonical role name
+    LEVEL_NAMES = {'head': 'head of'}
+    
+    # Words and phrases about the contract rather than the role
+    NOISE = re.compile(
+        r'\b(?:contract(?:or)?|temp(?:orary)?|permanent|part[\s-]?time|full[\s-]?time|freelance|'
+        r'urgent|immediate|remote|hybrid|\d+\s*(?:months?|mths?|years?|yrs?))\b'
+    )
+    # "Vice President" is read as the seniority word "vp"
+    VICE_PRESIDENT = re.compile(r'\bvice[\s-]+presidents?\b')
+    # Parenthesized qualifiers such as "(AWS)" or "[Contract]"
+    QUALIFIERS = re.compile(r'[(\[{][^)\]}]*[)\]}]')
+    # The core role is the first segment: "DevOps Engineer - Kubernetes", "Team Lead, SQL"
+    SEPARATORS = re.compile(r'\s+[-|/:]\s+|[,;]')
+    TOKEN = re.compile(r"[a-z0-9][a-z0-9+#&'.]*")
+    CONNECTIVES = {'of', 'and', '&', 'for', 'the', 'in', 'to', 'a', 'an'}
+    
+    PRIME = (1 << 31) - 1
+    
+    def __init__(self, threshold=0.75, num_perm=64, bands=16, seed=0, skills=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, self.PRIME, num_perm, dtype=np.int64)
+        self._b = rng.integers(0, self.PRIME, num_perm, dtype=np.int64)
+        # Skill keywords trailing a role ("Data Analyst Tableau") are not part of it
+        skills = skills if skills is not None else SkillsAnalyzer.MATCHER.skills
+        self._skill_tokens = sorted(
+            (tuple(self.TOKEN.findall(skill.lower())) for skill in skills), key=len, reverse=True
+        )
+    
+    def split_title(self, title):
+        """(seniority, core role) of one title"""
+        text = self.QUALIFIERS.sub(' ', str(title).lower())
+        text = self.NOISE.sub(' ', text)
+        text = self.VICE_PRESIDENT.sub(' vp ', text)
+        level, core = 'unspecified', None
+        for segment in self.SEPARATORS.split(text):
+            words = [token.rstrip('.') for token in self.TOKEN.findall(segment)]
+            # Leading prefixes may follow each other ("Assistant Head of Sales")
+            found, matched = [], True
+            while matched:
+                matched = False
+                for prefix, seniority in self.LEADING_SENIORITY.items():
+                    if tuple(words[:len(prefix)]) == prefix:
+                        words, matched = words[len(prefix):], True
+                        found.append(seniority)
+                        break
+            tokens = []
+            for token in words:
+                seniority = self.SENIORITY.get(token)
+                if seniority is None or (token == 'lead' and tokens[-1:] in (['team'], ['tech'])):
+                    tokens.append(token)
+                if seniority is not None:
+                    found.append(seniority)
+            for seniority in found:
+                if level == 'unspecified' or self.LEVELS.index(seniority) > self.LEVELS.index(level):
+                    level = seniority
+            if core is None:
+                tokens = self._strip(tokens)
+                core = ' '.join(tokens) or None
+        return level, core or TitleIndex.normalize(title)
+    
+    def _strip(self, tokens):
+        """Drop connectives at either end and skill keywords at the end, keeping at least one word"""
+        while tokens and tokens[0] in self.CONNECTIVES:
+            tokens = tokens[1:]
+        stripped = True
+        while stripped:
+            stripped = False
+            if len(tokens) > 1 and tokens[-1] in self.CONNECTIVES:
+                tokens, stripped = tokens[:-1], True
+            for skill in self._skill_tokens:
+                if skill and len(tokens) > len(skill) and tuple(tokens[-len(skill):]) == skill:
+                    tokens, stripped = tokens[:-len(skill)], True
+                    break
+        return tokens
+    
+    @staticmethod
+    def word_set(text):
+        """Words of a core role with plural endings dropped ("engineers" matches "engineer")"""
+        return frozenset(
+            word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+            for word in text.split()
+        ) or frozenset([text])
+    
+    def signatures(self, word_sets):
+        """MinHash signature (num_perm minimum hashes of the word set) per core role"""
+        owners, hashes = [], []
+        for i, words in enumerate(word_sets):
+            owners.extend([i] * len(words))
+            hashes.extend(zlib.crc32(word.encode()) for word in words)
+        owners = np.array(owners, dtype=np.int64)
+        hashes = np.array(hashes, dtype=np.int64) % self.PRIME
+        
+        # Every set has at least one word, so each owner is one contiguous run
+        starts = np.flatnonzero(np.diff(owners, prepend=-1))
+        signatures = np.empty((len(word_sets), self.num_perm), dtype=np.int64)
+        block = max(1, 4_000_000 // self.num_perm)
+        for lo in range(0, len(starts), block):
+            hi = min(lo + block, len(starts))
+            begin = starts[lo]
+            end = starts[hi] if hi < len(starts) else len(hashes)
+            permuted = (hashes[begin:end, None] * self._a + self._b) % self.PRIME
+            signatures[lo:hi] = np.minimum.reduceat(permuted, starts[lo:hi] - begin, axis=0)
+        return signatures
+    
+    def cluster(self, texts, weights=None):
+        """Leader id per core role
+        
+        Roles sharing an LSH band bucket are candidates; in order of weight,
+        each role joins the most similar candidate leader with the same head
+        noun and a word Jaccard of at least the threshold, or becomes a leader
+        itself, so clusters never chain.
+        """
+        n = len(texts)
+        weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        word_sets = [self.word_set(text) for text in texts]
+        heads = [max(self.word_set(text.split()[-1])) if text.split() else text for text in texts]
+        signatures = self.signatures(word_sets)
+        rows = self.num_perm // self.bands
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), -weights))] = np.arange(n)
+        
+        candidates = defaultdict(set)
+        for band in range(self.bands):
+            _, bucket = np.unique(signatures[:, band * rows:(band + 1) * rows], axis=0, return_inverse=True)
+            bucket = bucket.ravel()
+            order = np.argsort(bucket, kind='stable')
+            bounds = np.flatnonzero(np.diff(bucket[order])) + 1
+            for members in np.split(order, bounds):
+                if len(members) > 1:
+                    for i in members:
+                        candidates[i].update(members)
+        
+        leader = np.arange(n)
+        is_leader = np.zeros(n, dtype=bool)
+        for i in np.argsort(rank):
+            best, best_key = i, None
+            for j in candidates.get(i, ()):
+                if not is_leader[j] or rank[j] > rank[i] or heads[j] != heads[i]:
+                    continue
+                score = len(word_sets[i] & word_sets[j]) / len(word_sets[i] | word_sets[j])
+                # Most similar first, then the leader with the most postings
+                if score >= self.threshold and (best_key is None or (score, -rank[j]) > best_key):
+                    best, best_key = j, (score, -rank[j])
+            leader[i] = best
+            is_leader[i] = best == i
+        return leader
+    
+    def canonicalize(self, titles):
+        """canonical_role, seniority and role_family for every title (one row per posting)"""
+        codes, uniques = pd.factorize(titles)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        split = [self.split_title(title) for title in uniques]
+        levels = np.array([level for level, _ in split], dtype=object)
+        
+        # Cluster the distinct core roles, weighted by postings; each family is
+        # named after its leader, the most posted core role in it
+        core_codes, core_names = pd.factorize(pd.Series([core for _, core in split], dtype=object))
+        core_counts = np.bincount(core_codes, weights=counts, minlength=len(core_names))
+        leaders = self.cluster(list(core_names), core_counts)
+        family = np.asarray(core_names, dtype=object)[leaders][core_codes]
+        canonical = np.array([
+            name if level == 'unspecified' or level in name.split()
+            else f'{self.LEVEL_NAMES.get(level, level)} {name}'
+            for level, name in zip(levels, family)
+        ], dtype=object)
+        
+        def expand(values):
+            return pd.Series(np.append(values, None)[codes], index=titles.index, dtype=object)
+        
+        return pd.DataFrame({
+            'canonical_role': expand(canonical),
+            'seniority': expand(levels),
+            'role_family': expand(family),
+        })
+
+
+class RoleStatsCache:
+    """Thread-safe bounded LRU cache with a time-to-live, keyed by normalized role query
+    
+    One instance serves one version of the data; entries older than `ttl`
+    seconds are recomputed and the least recently used are evicted first.
+    """
+    
+    def __init__(self, maxsize=512, ttl=3600, on_lookup=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_lookup = on_lookup  # called with True on a hit, False on a miss
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(role_keyword):
+        """Queries differing only in case or spacing share an entry"""
+        return TitleIndex.normalize(role_keyword)
+    
+    def get_or_compute(self, role_keyword, compute):
+        """Return the cached value for a role, calling compute() on a miss"""
+        key = self.make_key(role_keyword)
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit, value = True, entry[1]
+            else:
+                self.misses += 1
+                hit = False
+        
+        if self.on_lookup is not None:
+            self.on_lookup(hit)
+        if hit:
+            return value
+        
+        value = compute()
+        
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
         
-        for skill in cls.FLAT_SKILLS:
-            if skill.upper() in text_upper:
-                found_skills.append(skill)
+        return value
+
+
+class MarketCube:
+    """Posting counts and salary sums pre-aggregated over the overview dimensions
+    
+    One row per (category, experience, position level, employment type) cell,
+    so market-wide charts aggregate a few thousand cells instead of every posting.
+    """
+    
+    DIMENSIONS = ['primary_category', 'minimumYearsExperience', 'positionLevels', 'employmentTypes']
+    
+    def __init__(self, cells):
+        self.cells = cells
+    
+    @classmethod
+    def build(cls, df):
+        """Aggregate a processed job DataFrame into cube cells"""
+        salary = df['average_salary'].astype('float64')
+        frame = df[cls.DIMENSIONS].assign(salary=salary, salary_sq=salary ** 2)
         
-        return list(set(found_skills))  # Remove duplicates
+        cells = frame.groupby(cls.DIMENSIONS, observed=True, dropna=False, sort=False).agg(
+            count=('salary', 'size'),
+            salary_sum=('salary', 'sum'),
+            salary_sq_sum=('salary_sq', 'sum')
+        )
+        return cls(cells.reset_index())
     
     @classmethod
-    def get_skills_by_role(cls, df, role_keyword, limit=50):
-        """Get most common skills for a specific role"""
-        filtered = df[df['title'].str.contains(role_keyword, case=False, na=False)]
-        filtered = filtered.head(limit)
+    def merge(cls, cubes):
+        """Combine cubes built over disjoint chunks of postings"""
+        cells = pd.concat([cube.cells for cube in cubes], ignore_index=True)
+        cells = cells.groupby(cls.DIMENSIONS, observed=True, dropna=False, sort=False)[
+            ['count', 'salary_sum', 'salary_sq_sum']
+        ].sum()
+        return cls(cells.reset_index())
+    
+    @property
+    def total_count(self):
+        return int(self.cells['count'].sum())
+    
+    @property
+    def avg_salary(self):
+        return self.cells['salary_sum'].sum() / self.cells['count'].sum()
+    
+    def category_counts(self):
+        """Postings per category, largest first (like value_counts)"""
+        counts = self.cells.groupby('primary_category', observed=True)['count'].sum()
+        return counts[counts > 0].sort_values(ascending=False)
+    
+    def experience_histogram(self, bins, max_years=20):
+        """Postings per experience bin for roles requiring at most max_years"""
+        cells = self.cells[self.cells['minimumYearsExperience'] <= max_years]
+        intervals = pd.cut(cells['minimumYearsExperience'], bins=bins)
+        return cells.groupby(intervals, observed=False)['count'].sum()
+    
+    def salary_by_experience(self, bins=None, max_years=15):
+        """Mean salary and posting count per experience year, or per bin when bins is given
         
-        all_skills = []
-        for title in filtered['title']:
-            all_skills.extend(cls.extract_skills(title))
+        Integer bins are spread over the full experience range, as pd.cut does on
+        the raw column.
+        """
+        experience = self.cells['minimumYearsExperience']
+        keys = experience if bins is None else pd.cut(experience, bins=bins)
         
-        skill_counts = Counter(all_skills)
-        return skill_counts
+        selected = experience <= max_years
+        grouped = self.cells[selected].groupby(keys[selected], observed=bins is None)[['salary_sum', 'count']].sum()
+        grouped['mean'] = grouped['salary_sum'] / grouped['count'].replace(0, np.nan)
+        
+        return grouped[['mean', 'count']]
+    
+    def category_stats(self, category):
+        """Statistics for an industry category"""
+        cells = self.cells[self.cells['primary_category'] == category]
+        count = cells['count'].sum()
+        
+        if count == 0:
+            return None
+        
+        def distribution(column):
+            counts = cells.groupby(column, observed=True)['count'].sum()
+            return counts[counts > 0].sort_values(ascending=False).to_dict()
+        
+        return {
+            'count': int(count),
+            'avg_salary': cells['salary_sum'].sum() / count,
+            'avg_experience': (cells['minimumYearsExperience'] * cells['count']).sum() / count,
+            'position_levels': distribution('positionLevels'),
+            'employment_types': distribution('employmentTypes')
+        }
+    
+    def save(self, path):
+        """Persist the cube cells as Parquet"""
+        self.cells.to_parquet(path, index=False)
     
     @classmethod
-    def get_skills_by_category(cls, df, category):
-        """Get common skills in a specific industry"""
-        filtered = df[df['primary_category'] == category]
+    def load(cls, path):
+        """Load persisted cube cells"""
+        return cls(pd.read_parquet(path))
+
+
+def weighted_median(values, counts):
+    """Median of values repeated counts times (same as Series.median on the expansion)"""
+    order = np.argsort(values, kind='stable')
+    values = np.asarray(values, dtype=np.float64)[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    total = cumulative[-1]
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
+
+
+class RoleCube:
+    """Per-role aggregates that can be built chunk by chunk and merged
+    
+    Every table is a count (or sum) keyed by normalized title, so role statistics,
+    role skills and the transition graph can be served without the postings frame.
+    Experience is kept as value counts, which keeps its median exact. Salaries are
+    counted in SalarySketch buckets (median within SalarySketch.ACCURACY) and only
+    the TOP_COMPANIES most posting companies of each title are kept (approximate
+    top companies for titles posted by more), so the tables grow with the number
+    of titles rather than with distinct salaries or companies.
+    """
+    
+    TABLES = {
+        'roles': ['title'],
+        'experience': ['title', 'minimumYearsExperience'],
+        'salaries': ['title', 'bucket'],
+        'companies': ['title', 'postedCompany_name'],
+        'statuses': ['title', 'status_jobStatus'],
+        'category_skills': ['primary_category', 'skill'],
+    }
+    TOP_COMPANIES = 50
+    
+    def __init__(self, tables):
+        self.tables = tables
+        self.roles = tables['roles'].set_index('title')
+        self._title_index = None
+        self._skill_index = None
+    
+    @classmethod
+    def build(cls, df, matcher=None):
+        """Aggregate a processed job DataFrame"""
+        matcher = matcher or SkillsAnalyzer.MATCHER
         
-        all_skills = []
-        for title in filtered['title'].head(100):
-            all_skills.extend(cls.extract_skills(title))
+        # Normalize each distinct title once
+        codes, uniques = pd.factorize(df['title'])
+        titles = pd.Series([TitleIndex.normalize(title) for title in uniques], dtype=object)
+        salary = df['average_salary']
+        frame = df.assign(
+            title=titles.to_numpy()[codes],
+            bucket=pd.Series(SalarySketch.buckets(salary), index=df.index).where(salary.notna())
+        )
         
-        skill_counts = Counter(all_skills)
-        return skill_counts.most_common(10)
+        def count(keys):
+            return frame.groupby(keys, observed=True, sort=False).size().rename('count').reset_index()
+        
+        roles = frame.groupby('title', sort=False).agg(
+            count=('average_salary', 'size'),
+            salary_sum=('average_salary', 'sum'),
+            salary_min_sum=('salary_minimum', 'sum'),
+            salary_max_sum=('salary_maximum', 'sum')
+        ).reset_index()
+        
+        # Skill counts per category from the postings x skills matrix of this chunk
+        skill_index = SkillIndex.build(df['title'], matcher)
+        category_codes, categories = pd.factorize(df['primary_category'])
+        valid = np.flatnonzero(category_codes >= 0)
+        membership = sparse.csr_matrix(
+            (np.ones(len(valid)), (category_codes[valid], valid)), shape=(len(categories), len(df))
+        )
+        totals = (membership @ skill_index.matrix).tocoo()
+        category_skills = pd.DataFrame({
+            'primary_category': np.asarray(categories, dtype=object)[totals.row],
+            'skill': np.asarray(matcher.skills, dtype=object)[totals.col],
+            'count': totals.data.astype(np.int64)
+        })
+        
+        return cls({
+            'roles': roles,
+            'experience': count(['title', 'minimumYearsExperience']),
+            'salaries': count(['title', 'bucket']).astype({'bucket': np.int32}),
+            'companies': cls.top_companies(count(['title', 'postedCompany_name'])),
+            'statuses': count(['title', 'status_jobStatus']),
+            'category_skills': category_skills,
+        })
+    
+    @classmethod
+    def merge(cls, cubes):
+        """Combine cubes built over disjoint chunks of postings"""
+        tables = {}
+        for name, keys in cls.TABLES.items():
+            table = pd.concat([cube.tables[name] for cube in cubes], ignore_index=True)
+            tables[name] = table.groupby(keys, observed=True, sort=False).sum().reset_index()
+        tables['companies'] = cls.top_companies(tables['companies'])
+        return cls(tables)
+    
+    @classmethod
+    def top_companies(cls, companies):
+        """The TOP_COMPANIES most posting companies of each title, in table order"""
+        top = companies.sort_values('count', ascending=False, kind='stable')
+        return companies.loc[top.groupby('title', sort=False).head(cls.TOP_COMPANIES).index.sort_values()]
+    
+    @property
+    def total_count(self):
+        return int(self.roles['count'].sum())
+    
+    @property
+    def title_index(self):
+        if self._title_index is None:
+            self._title_index = TitleIndex(self.roles.index.to_series())
+        return self._title_index
+    
+    @property
+    def skill_index(self):
+        """Role x skill matrix over the role names"""
+        if self._skill_index is None:
+            self._skill_index = SkillIndex.build(self.roles.index.to_series())
+        return self._skill_index
+    
+    def find_roles(self, role_keyword):
+        """Names of roles whose title contains role_keyword"""
+        return self.roles.index[self.title_index.match_titles(role_keyword)]
+    
+    def role_stats(self, role_keyword):
+        """Same statistics as MarketAnalyzer.get_role_stats, from the aggregates"""
+        titles = self.find_roles(role_keyword)
+        if len(titles) == 0:
+            return None
+        
+        def select(name):
+            table = self.tables[name]
+            return table[table['title'].isin(titles)]
+        
+        roles = self.roles.loc[titles]
+        count = int(roles['count'].sum())
+        
+        experience = select('experience')
+        experience = experience.groupby('minimumYearsExperience')['count'].sum()
+        experience = experience[experience > 0]
+        salaries = select('salaries')
+        
+        def top(name, column, n=None):
+            counts = select(name).groupby(column, observed=True)['count'].sum()
+            counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+            return (counts if n is None else counts.head(n)).to_dict()
+        
+        return {
+            'count': count,
+            'avg_salary': float(roles['salary_sum'].sum() / count),
+            'min_salary': float(roles['salary_min_sum'].sum() / count),
+            'max_salary': float(roles['salary_max_sum'].sum() / count),
+            'median_salary': float(weighted_median(
+                SalarySketch.bucket_values(salaries['bucket']), salaries['count']
+            )),
+            'min_experience': int(experience.index.min()),
+            'avg_experience': float((experience.index.to_numpy() * experience.to_numpy()).sum() / count),
+            'median_experience': float(weighted_median(experience.index, experience.to_numpy())),
+            'max_experience': int(experience.index.max()),
+            'top_companies': top('companies', 'postedCompany_name', 5),
+            'job_status_dist': top('statuses', 'status_jobStatus')
+        }
+    
+    def role_skills(self, role_keyword):
+        """Skill counts over every posting for a role"""
+        ids = self.title_index.match_titles(role_keyword)
+        weights = self.roles['count'].to_numpy()[ids]
+        totals = self.skill_index.matrix[ids].T @ weights
+        return Counter({self.skill_index.skills[i]: int(totals[i]) for i in np.flatnonzero(totals)})
+    
+    def category_skills(self, category, n=10):
+        """Most common skills in an industry category"""
+        table = self.tables['category_skills']
+        counts = table[table['primary_category'] == category].groupby('skill')['count'].sum()
+        
+        # Vocabulary order breaks ties, as in SkillIndex.counts
+        order = self.skill_index.skills
+        return Counter({skill: int(counts[skill]) for skill in order if counts.get(skill, 0) > 0}).most_common(n)
+    
+    def transition_graph(self, min_postings=1, max_neighbors=10):
+        """Role transition graph built from the role aggregates"""
+        experience = self.tables['experience']
+        experience_sum = (experience['minimumYearsExperience'] * experience['count']).groupby(
+            experience['title']
+        ).sum().reindex(self.roles.index, fill_value=0)
+        
+        counts = self.roles['count'].to_numpy()
+        return TransitionGraph.from_roles(
+            self.roles.index.to_numpy(dtype=object), self.skill_index.matrix > 0, self.skill_index.skills,
+            experience_sum.to_numpy() / counts, self.roles['salary_sum'].to_numpy() / counts, counts,
+            min_postings=min_postings, max_neighbors=max_neighbors
+        )
+
+
+class SalarySketch:
+    """Mergeable salary quantile sketches per role, category and experience level
+    
+    Salaries are counted in logarithmic buckets (as in DDSketch), each holding
+    only values within ACCURACY of its representative value. Any quantile over
+    any combination of cells is therefore within that relative error, and
+    sketches built over separate chunks merge by adding bucket counts.
+    
+    `titles` lists the normalized posting titles of every role (each role name
+    is also a title of itself), so a typed title finds the canonical roles it
+    was clustered into without the postings frame.
+    """
+    
+    DIMENSIONS = ['role', 'primary_category', 'experience_level']
+    ACCURACY = 0.01
+    GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+    BANDS = (0.1, 0.25, 0.5, 0.75, 0.9)
+    
+    def __init__(self, cells, titles=None):
+        self.cells = cells
+        self.titles = self._with_role_names(cells, titles)
+        self._role_index = None
+    
+    @staticmethod
+    def _with_role_names(cells, titles):
+        """Distinct (title, role) pairs, including each role as a title of itself"""
+        roles = pd.Series(cells['role'].dropna().unique(), dtype=object)
+        pairs = [pd.DataFrame({'title': roles, 'role': roles})]
+        if titles is not None:
+            pairs.append(titles[['title', 'role']].astype(object))
+        return pd.concat(pairs, ignore_index=True).dropna().drop_duplicates(ignore_index=True)
+    
+    @classmethod
+    def buckets(cls, salaries):
+        """Bucket id of each salary (0 holds everything up to 1, including missing values)"""
+        salaries = np.asarray(salaries, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ids = np.ceil(np.log(salaries) / np.log(cls.GAMMA))
+        return np.where(salaries > 1, ids, 0).astype(np.int32)
+    
+    @classmethod
+    def bucket_values(cls, buckets):
+        """Representative salary of each bucket"""
+        buckets = np.asarray(buckets)
+        return np.where(buckets > 0, 2 * cls.GAMMA ** buckets / (cls.GAMMA + 1), 0.0)
+    
+    @classmethod
+    def build(cls, df, experience_levels):
+        """Sketch a processed job DataFrame
+        
+        experience_levels maps a level name to its [low, high) years, as in
+        config.EXPERIENCE_LEVELS.
+        """
+        codes, roles = role_codes(df)
+        years = df['minimumYearsExperience'].to_numpy(dtype=np.float64)
+        levels = np.full(len(df), None, dtype=object)
+        for name, (low, high) in experience_levels.items():
+            levels[(years >= low) & (years < high)] = name
+        
+        frame = pd.DataFrame({
+            'role': np.append(roles, None)[codes],
+            'primary_category': np.asarray(df['primary_category'], dtype=object),
+            'experience_level': levels,
+            'bucket': cls.buckets(df['average_salary']),
+        })
+        cells = frame.groupby(cls.DIMENSIONS + ['bucket'], dropna=False, sort=False).size()
+        
+        # Role of each distinct title (a title is clustered into one role)
+        title_codes, titles = pd.factorize(df['title'])
+        pairs = pd.DataFrame({'title': title_codes, 'role': codes}).drop_duplicates()
+        pairs = pairs[(pairs['title'] >= 0) & (pairs['role'] >= 0)]
+        names = np.array([TitleIndex.normalize(title) for title in titles], dtype=object)
+        titles = pd.DataFrame({
+            'title': names[pairs['title'].to_numpy()], 'role': roles[pairs['role'].to_numpy()]
+        })
+        return cls(cells.rename('count').reset_index(), titles)
+    
+    @classmethod
+    def merge(cls, sketches):
+        """Combine sketches built over disjoint chunks of postings"""
+        cells = pd.concat([sketch.cells for sketch in sketches], ignore_index=True)
+        cells = cells.groupby(cls.DIMENSIONS + ['bucket'], dropna=False, sort=False)['count'].sum()
+        titles = pd.concat([sketch.titles for sketch in sketches], ignore_index=True)
+        return cls(cells.reset_index(), titles)
+    
+    @property
+    def total_count(self):
+        return int(self.cells['count'].sum())
+    
+    def build_role_index(self):
+        """Substring index over the titles, built on first use"""
+        if self._role_index is None:
+            self._role_index = TitleIndex(self.titles['title'])
+        return self._role_index
+    
+    def find_roles(self, query):
+        """Roles named like the query or posted under a title containing it"""
+        rows = self.build_role_index().search(query)
+        return pd.unique(self.titles['role'].to_numpy()[rows])
+    
+    def select(self, role=None, category=None, experience_level=None):
+        """Merged bucket counts of the cells matching every given filter
+        
+        role is a query (see find_roles) or a list of role names.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        if isinstance(role, str):
+            mask &= self.cells['role'].isin(self.find_roles(role)).to_numpy()
+        elif role is not None:
+            mask &= self.cells['role'].isin(list(role)).to_numpy()
+        if category is not None:
+            mask &= (self.cells['primary_category'] == category).to_numpy()
+        if experience_level is not None:
+            mask &= (self.cells['experience_level'] == experience_level).to_numpy()
+        return self.cells[mask].groupby('bucket')['count'].sum()
+    
+    def quantiles(self, qs=BANDS, **filters):
+        """{q: salary} for each quantile over the selected cells (None when no postings match)"""
+        counts = self.select(**filters)
+        total = counts.sum()
+        if total == 0:
+            return None
+        
+        ranks = np.floor(np.asarray(qs, dtype=np.float64) * (total - 1))
+        positions = np.searchsorted(counts.cumsum().to_numpy(), ranks, side='right')
+        values = self.bucket_values(counts.index.to_numpy()[positions])
+        return {q: float(value) for q, value in zip(qs, values)}
+    
+    def save(self, path, titles_path):
+        """Persist the sketch cells and the role titles as Parquet"""
+        self.cells.to_parquet(path, index=False)
+        self.titles.to_parquet(titles_path, index=False)
+    
+    @classmethod
+    def load(cls, path, titles_path=None):
+        """Load persisted sketch cells (and role titles, when saved)"""
+        titles = pd.read_parquet(titles_path) if titles_path and os.path.exists(titles_path) else None
+        return cls(pd.read_parquet(path), titles)
 
 
 class CareerPathAnalyzer:
@@ -218,32 +1529,44 @@ class CareerPathAnalyzer:
 class MarketAnalyzer:
     """Provides market insights and analysis"""
     
-    @staticmethod
-    def get_role_stats(df, role_keyword):
-        """Get comprehensive statistics for a role"""
-        filtered = df[df['title'].str.contains(role_keyword, case=False, na=False)]
+    @classmethod
+    def get_role_stats(cls, df, role_keyword, title_index=None, cache=None):
+        """Get comprehensive statistics for a role
+        
+        With a RoleStatsCache, popular roles are computed once per data version.
+        """
+        if cache is not None:
+            return cache.get_or_compute(
+                role_keyword, lambda: cls.get_role_stats(df, role_keyword, title_index)
+            )
+        
+        filtered = df.iloc[find_title_rows(df, role_keyword, title_index)]
         
         if len(filtered) == 0:
             return None
         
         stats = {
             'count': len(filtered),
-            'avg_salary': filtered['average_salary'].mean(),
-            'min_salary': filtered['salary_minimum'].mean(),
-            'max_salary': filtered['salary_maximum'].mean(),
-            'median_salary': filtered['average_salary'].median(),
-            'min_experience': filtered['minimumYearsExperience'].min(),
-            'avg_experience': filtered['minimumYearsExperience'].mean(),
-            'max_experience': filtered['minimumYearsExperience'].max(),
-            'top_companies': filtered['postedCompany_name'].value_counts().head(5).to_dict(),
-            'job_status_dist': filtered['status_jobStatus'].value_counts().to_dict()
+            'avg_salary': float(filtered['average_salary'].mean()),
+            'min_salary': float(filtered['salary_minimum'].mean()),
+            'max_salary': float(filtered['salary_maximum'].mean()),
+            'median_salary': float(filtered['average_salary'].median()),
+            'min_experience': int(filtered['minimumYearsExperience'].min()),
+            'avg_experience': float(filtered['minimumYearsExperience'].mean()),
+            'median_experience': float(filtered['minimumYearsExperience'].median()),
+            'max_experience': int(filtered['minimumYearsExperience'].max()),
+            'top_companies': filtered['postedCompany_name'].value_counts().loc[lambda counts: counts > 0].head(5).to_dict(),
+            'job_status_dist': filtered['status_jobStatus'].value_counts().loc[lambda counts: counts > 0].to_dict()
         }
         
         return stats
     
     @staticmethod
-    def get_category_stats(df, category):
+    def get_category_stats(df, category, cube=None):
         """Get statistics for an industry category"""
+        if cube is not None:
+            return cube.category_stats(category)
+        
         filtered = df[df['primary_category'] == category]
         
         if len(filtered) == 0:
@@ -253,48 +1576,253 @@ class MarketAnalyzer:
             'count': len(filtered),
             'avg_salary': filtered['average_salary'].mean(),
             'avg_experience': filtered['minimumYearsExperience'].mean(),
-            'position_levels': filtered['positionLevels'].value_counts().to_dict(),
-            'employment_types': filtered['employmentTypes'].value_counts().to_dict()
+            'position_levels': filtered['positionLevels'].value_counts().loc[lambda counts: counts > 0].to_dict(),
+            'employment_types': filtered['employmentTypes'].value_counts().loc[lambda counts: counts > 0].to_dict()
         }
         
         return stats
     
     @staticmethod
-    def get_salary_by_experience(df, max_years=15):
+    def get_salary_by_experience(df, max_years=15, cube=None):
         """Get average salary by experience level"""
+        if cube is not None:
+            return cube.salary_by_experience(max_years=max_years)
+        
         filtered = df[df['minimumYearsExperience'] <= max_years]
         salary_by_exp = filtered.groupby('minimumYearsExperience')['average_salary'].agg(['mean', 'count'])
         
         return salary_by_exp
 
 
+class TransitionGraph:
+    """Directed role-transition graph for multi-hop career paths
+    
+    Nodes are normalized job titles. Each role links to its closest roles by a
+    cost that grows with skill dissimilarity, seniority change and salary loss,
+    so cheap paths are realistic sequences of moves.
+    """
+    
+    HOP_COST = 0.05          # Keeps every edge positive and favours fewer moves
+    SENIORITY_WEIGHT = 0.5   # Per 10 years of change in required experience
+    SALARY_WEIGHT = 1.0      # Per 100% salary drop
+    
+    def __init__(self, roles, role_skills, skills, experience, salary, counts, edges):
+        self.roles = list(roles)
+        self.role_skills = sparse.csr_matrix(role_skills)
+        self.skills = list(skills)
+        self.experience = np.asarray(experience, dtype=np.float64)
+        self.salary = np.asarray(salary, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.edges = edges
+        
+        src, dst, cost = edges
+        n = len(self.roles)
+        self._adj = sparse.csr_matrix((cost, (src, dst)), shape=(n, n))
+        self._adj_reverse = self._adj.T.tocsr()
+        self._role_index = TitleIndex(pd.Series(self.roles, dtype=object))
+        self._role_names = pd.Index(self.roles)
+    
+    @classmethod
+    def edge_cost(cls, jaccard, exp_from, exp_to, salary_from, salary_to):
+        """Cost of moving between two roles (lower is easier)"""
+        salary_loss = np.clip((salary_from - salary_to) / np.maximum(salary_from, 1), 0, None)
+        return (
+            cls.HOP_COST
+            + (1 - jaccard)
+            + cls.SENIORITY_WEIGHT * np.abs(exp_to - exp_from) / 10
+            + cls.SALARY_WEIGHT * salary_loss
+        )
+    
+    @classmethod
+    def build(cls, df, skill_index, min_postings=1, max_neighbors=10, block_size=512):
+        """Build the graph from a processed DataFrame and its aligned SkillIndex"""
+        # Map every posting to its canonical (or normalized) role
+        codes, roles = role_codes(df)
+        
+        valid = np.flatnonzero(codes >= 0)
+        n_roles = len(roles)
+        counts = np.bincount(codes[valid], minlength=n_roles)
+        experience = np.bincount(
+            codes[valid], weights=df['minimumYearsExperience'].to_numpy(dtype=np.float64)[valid], minlength=n_roles
+        ) / np.maximum(counts, 1)
+        salary = np.bincount(
+            codes[valid], weights=df['average_salary'].to_numpy(dtype=np.float64)[valid], minlength=n_roles
+        ) / np.maximum(counts, 1)
+        
+        # Role x skill incidence from the posting x skill index
+        membership = sparse.csr_matrix(
+            (np.ones(len(valid), dtype=np.float32), (codes[valid], valid)),
+            shape=(n_roles, len(skill_index))
+        )
+        role_skills = (membership @ skill_index.matrix.astype(np.float32)) > 0
+        
+        return cls.from_roles(
+            roles, role_skills, skill_index.skills, experience, salary, counts,
+            min_postings=min_postings, max_neighbors=max_neighbors, block_size=block_size
+        )
+    
+    @classmethod
+    def from_roles(cls, roles, role_skills, skills, experience, salary, counts,
+                   min_postings=1, max_neighbors=10, block_size=512):
+        """Build the graph from per-role aggregates (role x skill incidence, means, counts)"""
+        role_skills = sparse.csr_matrix(role_skills)
+        keep = np.flatnonzero((counts >= min_postings) & (role_skills.getnnz(axis=1) > 0))
+        role_skills = sparse.csr_matrix(role_skills[keep], dtype=np.float32)
+        roles, counts, experience, salary = roles[keep], counts[keep], experience[keep], salary[keep]
+        
+        # Skill overlap in row blocks, keeping each role's cheapest outgoing edges
+        sizes = role_skills.getnnz(axis=1)
+        edge_parts = []
+        for start in range(0, len(keep), block_size):
+            overlap = (role_skills[start:start + block_size] @ role_skills.T).tocoo()
+            src, dst, shared = overlap.row + start, overlap.col, overlap.data
+            not_self = src != dst
+            src, dst, shared = src[not_self], dst[not_self], shared[not_self]
+            
+            jaccard = shared / (sizes[src] + sizes[dst] - shared)
+            cost = cls.edge_cost(jaccard, experience[src], experience[dst], salary[src], salary[dst])
+            
+            order = np.lexsort((cost, src))
+            src, dst, cost = src[order], dst[order], cost[order]
+            first = np.r_[True, src[1:] != src[:-1]] if len(src) else np.empty(0, dtype=bool)
+            rank = np.arange(len(src)) - np.flatnonzero(first)[np.cumsum(first) - 1]
+            cheapest = rank < max_neighbors
+            edge_parts.append((src[cheapest], dst[cheapest], cost[cheapest]))
+        
+        edges = tuple(
+            np.concatenate([part[i] for part in edge_parts]) if edge_parts else np.empty(0)
+            for i in range(3)
+        )
+        return cls(roles, role_skills, skills, experience, salary, counts, edges)
+    
+    def find_roles(self, query):
+        """Node ids of roles whose name contains the query, or of the named roles for a list of names"""
+        if isinstance(query, str):
+            return self._role_index.match_titles(query)
+        return np.flatnonzero(self._role_names.isin(list(query)))
+    
+    def role_skill_set(self, nodes):
+        """Union of skills held by the given roles"""
+        if len(nodes) == 0:
+            return set()
+        present = np.flatnonzero(self.role_skills[nodes].getnnz(axis=0))
+        return {self.skills[i] for i in present}
+    
+    def best_paths(self, sources, targets, k=3):
+        """Cheapest source -> target paths through k distinct intermediate roles
+        
+        Runs one multi-source Dijkstra forward from the sources and one backward
+        from the targets; the best path via role v then costs d_source[v] + d_target[v].
+        """
+        sources = np.setdiff1d(sources, targets)
+        if len(sources) == 0 or len(targets) == 0:
+            return []
+        
+        dist_from, pred_from, _ = csgraph.dijkstra(
+            self._adj, indices=sources, return_predecessors=True, min_only=True
+        )
+        dist_to, pred_to, _ = csgraph.dijkstra(
+            self._adj_reverse, indices=targets, return_predecessors=True, min_only=True
+        )
+        
+        through = dist_from + dist_to
+        through[sources] = np.inf
+        through[targets] = np.inf
+        
+        paths = []
+        for node in np.argsort(through)[:k]:
+            if not np.isfinite(through[node]):
+                break
+            path = [node]
+            while pred_from[path[0]] >= 0:
+                path.insert(0, pred_from[path[0]])
+            while pred_to[path[-1]] >= 0:
+                path.append(pred_to[path[-1]])
+            paths.append((node, [self.roles[i] for i in path], float(through[node])))
+        
+        return paths
+    
+    def stepping_stones(self, current_role, target_role, max_gaps=3):
+        """Intermediate roles on the cheapest paths from current to target role
+        
+        Each role is a query or a list of role names (see find_roles).
+        """
+        sources = self.find_roles(current_role)
+        targets = self.find_roles(target_role)
+        current_skills = self.role_skill_set(sources)
+        target_skills = self.role_skill_set(targets)
+        
+        stones = []
+        for node, path, cost in self.best_paths(sources, targets, k=max_gaps):
+            role_skills = self.role_skill_set([node])
+            stones.append({
+                'role': self.roles[node],
+                'overlap_current': len(role_skills & current_skills),
+                'overlap_target': len(role_skills & target_skills),
+                'avg_salary': float(self.salary[node]),
+                'avg_experience': float(self.experience[node]),
+                'path': path,
+                'cost': round(cost, 3)
+            })
+        
+        return stones
+    
+    def save(self, path):
+        """Persist the graph"""
+        src, dst, cost = self.edges
+        np.savez_compressed(
+            path,
+            roles=np.array(self.roles, dtype=str), skills=np.array(self.skills, dtype=str),
+            experience=self.experience, salary=self.salary, counts=self.counts,
+            skill_indices=self.role_skills.indices, skill_indptr=self.role_skills.indptr,
+            src=src, dst=dst, cost=cost
+        )
+    
+    @classmethod
+    def load(cls, path):
+        """Load a persisted graph"""
+        with np.load(path) as stored:
+            roles = stored['roles'].tolist()
+            skills = stored['skills'].tolist()
+            role_skills = sparse.csr_matrix(
+                (np.ones(len(stored['skill_indices']), dtype=np.float32),
+                 stored['skill_indices'], stored['skill_indptr']),
+                shape=(len(roles), len(skills))
+            )
+            edges = (stored['src'], stored['dst'], stored['cost'])
+            return cls(roles, role_skills, skills, stored['experience'],
+                       stored['salary'], stored['counts'], edges)
+
+
 class TransitionPathFinder:
     """Finds realistic transition paths between roles"""
     
     @staticmethod
-    def find_stepping_stones(df, current_role, target_role, max_gaps=3):
-        """Find intermediate roles for career transition"""
-        # This is simplified - in production, would use more sophisticated graph algorithms
+    def find_stepping_stones(df, current_role, target_role, max_gaps=3, title_index=None, graph=None):
+        """Find intermediate roles for career transition
+        
+        With a TransitionGraph the stones come from the cheapest multi-hop paths
+        over every role in the data. Otherwise every canonical role is scanned
+        when the frame has them, or a 500-title sample when it does not.
+        """
+        if graph is not None:
+            return graph.stepping_stones(current_role, target_role, max_gaps)
         
-        current_roles = df[df['title'].str.contains(current_role, case=False, na=False)]
-        target_roles = df[df['title'].str.contains(target_role, case=False, na=False)]
+        current_roles = df.iloc[find_title_rows(df, current_role, title_index)]
+        target_roles = df.iloc[find_title_rows(df, target_role, title_index)]
+        
+        current_skills_sample = set(SkillsAnalyzer.MATCHER.count_skills(current_roles['title'].head(10)))
+        target_skills_sample = set(SkillsAnalyzer.MATCHER.count_skills(target_roles['title'].head(10)))
         
         # Find roles that share skills with both current and target
         intermediate_candidates = []
         
-        all_roles = df['title'].unique()
-        for role in all_roles[:500]:  # Sample for performance
-            role_skills = SkillsAnalyzer.extract_skills(role)
-            
-            current_skills_sample = set()
-            target_skills_sample = set()
-            
-            for title in current_roles['title'].head(10):
-                current_skills_sample.update(SkillsAnalyzer.extract_skills(title))
-            
-            for title in target_roles['title'].head(10):
-                target_skills_sample.update(SkillsAnalyzer.extract_skills(title))
-            
+        if 'canonical_role' in df.columns:
+            all_roles = pd.Series(df['canonical_role'].dropna().unique())
+        else:
+            all_roles = pd.Series(df['title'].unique()[:500])  # Sample for performance
+        all_role_skills = SkillsAnalyzer.extract_skills_series(all_roles)
+        for role, role_skills in zip(all_roles, all_role_skills):
             overlap_current = len(set(role_skills) & current_skills_sample)
             overlap_target = len(set(role_skills) & target_skills_sample)
             